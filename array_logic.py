@@ -0,0 +1,356 @@
+from collections import deque
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError:  # numpy est optionnel : le moteur de game_logic reste utilisable sans
+    np = None
+
+from game_logic import HIDDEN, FLAG, BOMB, SaveError, make_rng, sample_bombs
+
+REVEALED = 1  # Bit d'état : case révélée
+FLAGGED = 2  # Bit d'état : drapeau posé
+
+
+class ArrayMinesweeper:
+    def __init__(self, rows, columns, bombs, seed=None, safe_zone=False, debug=False, verbose=True,
+                 instrumentation=None):
+        """
+        Variante du démineur stockée dans des tableaux numpy, destinée aux très grandes grilles.
+        Expose la même interface que game_logic.Minesweeper.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur le champ.
+        :param seed: Graine entière ou instance de random.Random pour une grille reproductible.
+        :param safe_zone: Si True, le carré 3x3 autour du premier clic ne contient aucune bombe.
+        :param debug: Si True, les compteurs sont vérifiés par un parcours complet à chaque requête.
+        :param verbose: Si False, la solution n'est pas affichée au premier clic (mode silencieux).
+        :param instrumentation: Instance de instrumentation.Instrumentation recevant les mesures, ou None.
+        """
+        if np is None:
+            raise ImportError("ArrayMinesweeper nécessite numpy (pip install numpy)")
+        if not 0 <= bombs < rows * columns:
+            raise ValueError(f"Impossible de placer {bombs} bombes sur une grille de {rows}x{columns}")
+        self.__rows = rows
+        self.__columns = columns
+        self.__bombs = bombs
+        self.__mines = np.zeros((rows, columns), dtype=np.int8)  # 1 si bombe
+        # Les chiffres et l'état sont bordés d'une case sentinelle (chiffre non nul, déjà révélée)
+        # pour que le remplissage n'ait aucun test de bornes à faire ; __numbers et __state en sont des vues.
+        self.__padded_numbers = np.ones((rows + 2, columns + 2), dtype=np.int8)
+        self.__padded_state = np.full((rows + 2, columns + 2), REVEALED, dtype=np.uint8)
+        self.__numbers = self.__padded_numbers[1:-1, 1:-1]  # Bombes adjacentes
+        self.__state = self.__padded_state[1:-1, 1:-1]  # Masque REVEALED / FLAGGED
+        self.__state[:] = 0
+        self.__flags = 0  # Drapeaux posés
+        self.__correct_flags = 0  # Drapeaux posés sur une bombe
+        self.__hidden_safe = rows * columns - bombs  # Cases sans bombe encore cachées
+        self.__first_click = True
+        self.__rng, self.__seed = make_rng(seed)
+        self.__safe_zone = safe_zone
+        self.__debug = debug
+        self.__verbose = verbose
+        self.__instr = instrumentation
+
+    def set_instrumentation(self, instrumentation):
+        """
+        Active ou désactive la mesure des appels du moteur.
+        :param instrumentation: Instance de instrumentation.Instrumentation, ou None pour désactiver.
+        """
+        self.__instr = instrumentation
+
+    def __place_bombs(self, first_click_row, first_click_col):
+        """
+        Place les bombes par tirage sans remise sur les indices à plat, en évitant
+        la case initiale cliquée par l'utilisateur (et ses voisines en mode safe_zone).
+        Une même graine produit la même grille que game_logic.Minesweeper.
+        :param first_click_row: Ligne du premier clic.
+        :param first_click_col: Colonne du premier clic.
+        """
+        flat = sample_bombs(self.__rng, self.__rows, self.__columns, self.__bombs,
+                            first_click_row, first_click_col, self.__safe_zone)
+        self.__mines.ravel()[np.array(flat, dtype=np.int64)] = 1
+
+        # Des drapeaux ont pu être posés avant le premier clic
+        self.__correct_flags = int(np.count_nonzero((self.__state == FLAGGED) & (self.__mines == 1)))
+
+    def __calculate_numbers(self):
+        """
+        Calcule le nombre de bombes adjacentes de toutes les cases en une seule passe,
+        en sommant les 8 décalages de la grille bordée de zéros.
+        """
+        padded = np.pad(self.__mines, 1)
+        numbers = self.__numbers
+        numbers[:] = 0
+        for x in range(3):
+            for y in range(3):
+                if x != 1 or y != 1:
+                    numbers += padded[x:x + self.__rows, y:y + self.__columns]
+
+    def __reveal_cells(self, row, col):
+        """
+        Révèle la case puis, en largeur, les cases adjacentes tant qu'aucune bombe
+        n'est présente autour. Chaque case n'est visitée qu'une seule fois.
+        :param row: Ligne de la cellule à révéler.
+        :param col: Colonne de la cellule à révéler.
+        :return: Liste des coordonnées (ligne, colonne) nouvellement révélées.
+        """
+        if self.__state[row, col]:
+            return []
+
+        # Vues à plat : l'indexation d'un memoryview est bien plus rapide que celle d'un tableau numpy
+        width = self.__columns + 2
+        state = memoryview(self.__padded_state.reshape(-1))
+        numbers = memoryview(self.__padded_numbers.reshape(-1))
+        offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+        start = (row + 1) * width + col + 1
+        state[start] = REVEALED
+        revealed = [start]
+        queue = deque(revealed)
+        while queue:
+            index = queue.popleft()
+            if numbers[index] != 0:
+                continue
+            for offset in offsets:
+                neighbor = index + offset
+                if not state[neighbor]:
+                    state[neighbor] = REVEALED
+                    revealed.append(neighbor)
+                    queue.append(neighbor)
+        return [(i - 1, j - 1) for i, j in (divmod(index, width) for index in revealed)]
+
+    def __visited(self, revealed):
+        """
+        Nombre de cases examinées par __reveal_cells pour produire revealed (mesures uniquement) :
+        chaque case vide révélée examine ses voisines dans la grille, elle-même exclue (les sentinelles
+        de la bordure ne comptent pas). Même définition que dans game_logic.Minesweeper.
+        :param revealed: Liste des coordonnées révélées.
+        """
+        numbers = self.__numbers
+        visited = 0
+        for i, j in revealed:
+            if numbers[i, j] == 0:
+                visited += (min(i + 2, self.__rows) - max(i - 1, 0)) * (min(j + 2, self.__columns) - max(j - 1, 0)) - 1
+        return visited
+
+    def display_solution(self):
+        """
+        Affiche la matrice complète contenant les solutions (bombes et chiffres).
+        """
+        print("--- Solution ---")
+        for mines_row, numbers_row in zip(self.__mines.tolist(), self.__numbers.tolist()):
+            print(" ".join(BOMB if m else str(n) for m, n in zip(mines_row, numbers_row)))
+
+    def generate(self, first_click_row, first_click_col):
+        """
+        Génère la grille (bombes et chiffres) autour du premier clic, si ce n'est pas déjà fait.
+        :param first_click_row: Ligne du premier clic.
+        :param first_click_col: Colonne du premier clic.
+        """
+        if not self.__first_click:
+            return
+        self.__place_bombs(first_click_row, first_click_col)
+        if self.__instr is not None:
+            start = perf_counter()
+            self.__calculate_numbers()
+            self.__instr.record("calculate_numbers", perf_counter() - start, cells=self.__rows * self.__columns)
+        else:
+            self.__calculate_numbers()
+        self.__first_click = False
+        if self.__verbose:
+            self.display_solution()  # Affiche la solution
+
+    def click_cell(self, row, col):
+        """
+        Gère le clic sur une cellule de la grille.
+        :param row: Ligne de la cellule cliquée.
+        :param col: Colonne de la cellule cliquée.
+        :return: Tuple (résultat, cases révélées), comme game_logic.Minesweeper.click_cell.
+        """
+        if self.__instr is not None:
+            start = perf_counter()
+            result, revealed = self.__click_cell(row, col)
+            self.__instr.record("click_cell", perf_counter() - start, result=result, revealed=len(revealed))
+            return result, revealed
+        return self.__click_cell(row, col)
+
+    def __click_cell(self, row, col):
+        """
+        Corps de click_cell, hors mesures.
+        """
+        if self.__state[row, col] & FLAGGED:
+            return "flagged", []
+
+        self.generate(row, col)  # Place les bombes avant le premier clic
+
+        if self.__mines[row, col]:
+            return "lost", []
+
+        if self.__instr is not None:
+            start = perf_counter()
+            revealed = self.__reveal_cells(row, col)
+            self.__instr.record("reveal_cells", perf_counter() - start, revealed=len(revealed),
+                                visited=self.__visited(revealed))
+        else:
+            revealed = self.__reveal_cells(row, col)
+        self.__hidden_safe -= len(revealed)
+        return "continue", revealed
+
+    def toggle_flag(self, row, col):
+        """
+        Ajoute ou retire un drapeau sur une cellule spécifique.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        if self.__instr is not None:
+            start = perf_counter()
+            self.__toggle_flag(row, col)
+            self.__instr.record("toggle_flag", perf_counter() - start, flags=self.__flags)
+        else:
+            self.__toggle_flag(row, col)
+
+    def __toggle_flag(self, row, col):
+        """
+        Corps de toggle_flag, hors mesures.
+        """
+        state = self.__state[row, col]
+        if state == 0:
+            self.__state[row, col] = FLAGGED
+            delta = 1
+        elif state == FLAGGED:
+            self.__state[row, col] = 0
+            delta = -1
+        else:
+            return
+
+        self.__flags += delta
+        if self.__mines[row, col]:
+            self.__correct_flags += delta
+
+    def is_won(self):
+        """
+        Vérifie si le joueur a gagné la partie : toutes les cases sans bombe sont révélées.
+        :return: True si la partie est gagnée, False sinon.
+        """
+        if self.__instr is not None:
+            start = perf_counter()
+            won = self.__is_won()
+            self.__instr.record("is_won", perf_counter() - start, hidden_safe=self.__hidden_safe)
+            return won
+        return self.__is_won()
+
+    def __is_won(self):
+        """
+        Corps de is_won, hors mesures.
+        """
+        if self.__debug:
+            self.__check_counters()
+        return not self.__first_click and self.__hidden_safe == 0
+
+    def remaining_mines(self):
+        """
+        Nombre de bombes restant à marquer, d'après les drapeaux posés.
+        :return: Nombre de bombes moins nombre de drapeaux (peut être négatif).
+        """
+        if self.__debug:
+            self.__check_counters()
+        return self.__bombs - self.__flags
+
+    def correct_flags(self):
+        """
+        Nombre de drapeaux posés sur une bombe.
+        :return: Nombre de drapeaux corrects.
+        """
+        if self.__debug:
+            self.__check_counters()
+        return self.__correct_flags
+
+    def __check_counters(self):
+        """
+        Recompte l'état sur les tableaux complets et le compare aux compteurs
+        maintenus incrémentalement (mode debug uniquement).
+        """
+        flagged = self.__state == FLAGGED
+        safe = self.__mines == 0
+        hidden_safe = int(np.count_nonzero(safe & ((self.__state & REVEALED) == 0)))
+        if self.__first_click:
+            hidden_safe -= self.__bombs  # Les bombes ne sont pas encore placées
+        actual = (hidden_safe, int(np.count_nonzero(flagged)), int(np.count_nonzero(flagged & ~safe)))
+        expected = (self.__hidden_safe, self.__flags, self.__correct_flags)
+        if expected != actual:
+            raise RuntimeError(
+                f"Compteurs incohérents : (cachées sûres, drapeaux, drapeaux corrects) = {expected}, "
+                f"parcours complet = {actual}"
+            )
+
+    def get_seed(self):
+        """
+        Retourne la graine de la partie.
+        :return: Graine entière, ou None si un générateur random.Random a été fourni.
+        """
+        return self.__seed
+
+    def export_state(self):
+        """
+        Exporte l'état complet de la partie, comme game_logic.Minesweeper.export_state.
+        :return: Dictionnaire (rows, columns, bombs, seed, generated, mines, revealed, flags).
+        """
+        return {
+            "rows": self.__rows,
+            "columns": self.__columns,
+            "bombs": self.__bombs,
+            "seed": self.__seed,
+            "generated": not self.__first_click,
+            "mines": self.__mines.tobytes(),
+            "revealed": ((self.__state & REVEALED) != 0).tobytes(),
+            "flags": (self.__state == FLAGGED).tobytes(),
+        }
+
+    @classmethod
+    def from_state(cls, state, **options):
+        """
+        Reconstruit une partie à partir d'un état produit par export_state.
+        :param state: Dictionnaire (rows, columns, bombs, seed, generated, mines, revealed, flags).
+        :param options: Options supplémentaires du constructeur (safe_zone, debug, verbose).
+        :return: Nouvelle instance d'ArrayMinesweeper.
+        """
+        rows, columns = state["rows"], state["columns"]
+        if not 0 <= state["bombs"] < rows * columns:
+            raise SaveError(f"Impossible de placer {state['bombs']} bombes sur une grille de {rows}x{columns}")
+        if state["generated"] and state["mines"].count(1) != state["bombs"]:
+            raise SaveError(f"{state['mines'].count(1)} bombes dans la grille, {state['bombs']} annoncées")
+        game = cls(rows, columns, state["bombs"], seed=state["seed"], **options)
+        revealed = np.frombuffer(state["revealed"], dtype=np.uint8).reshape(rows, columns)
+        flags = np.frombuffer(state["flags"], dtype=np.uint8).reshape(rows, columns)
+        if state["generated"]:
+            game.__mines[:] = np.frombuffer(state["mines"], dtype=np.int8).reshape(rows, columns)
+            game.__calculate_numbers()
+            game.__first_click = False
+        game.__state[:] = revealed * REVEALED | flags * FLAGGED
+
+        game.__hidden_safe = rows * columns - state["bombs"] - int(np.count_nonzero(revealed))
+        game.__flags = int(np.count_nonzero(flags))
+        game.__correct_flags = int(np.count_nonzero(flags & (game.__mines == 1)))
+        return game
+
+    def get_cell(self, row, col):
+        """
+        Retourne la valeur affichée d'une seule case sans construire toute la matrice.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        :return: Valeur affichée (chiffre, drapeau ou case cachée).
+        """
+        state = self.__state[row, col]
+        if state & REVEALED:
+            return str(self.__numbers[row, col])
+        return FLAG if state == FLAGGED else HIDDEN
+
+    def get_display_matrix(self):
+        """
+        Construit la matrice à afficher pour le joueur, identique à celle de game_logic.Minesweeper.
+        :return: Matrice affichée (liste de listes de chaînes).
+        """
+        digits = np.array([str(n) for n in range(9)])
+        display = np.where(self.__state & REVEALED, digits[self.__numbers], HIDDEN)
+        display[self.__state == FLAGGED] = FLAG
+        return display.tolist()
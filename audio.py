@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class BackgroundMusic:
+    def __init__(self, path="music.mp3"):
+        """
+        Musique de fond chargée dans un fil d'exécution d'arrière-plan : l'import de pygame,
+        l'initialisation du mixeur et le décodage du fichier ne retardent pas l'affichage.
+        :param path: Fichier audio joué en boucle.
+        """
+        self.path = path
+        self.ready_at = None  # Instant (time.perf_counter) où la musique a commencé
+        self.error = None  # Raison de l'échec du chargement, le cas échéant
+        self.__thread = None
+        self.__lock = threading.Lock()
+        self.__pygame = None
+
+    def start(self):
+        """
+        Lance le chargement et la lecture, une seule fois pour toute la durée de l'application.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__load, daemon=True)
+                self.__thread.start()
+
+    def __load(self):
+        """
+        Importe pygame, initialise le mixeur puis joue la musique en boucle.
+        """
+        try:
+            import pygame  # Import différé : pygame est long à charger
+            pygame.mixer.init()
+            pygame.mixer.music.load(self.path)
+            pygame.mixer.music.play(-1)
+        except Exception as error:  # Pas de pygame, pas de carte son ou fichier absent : le jeu continue
+            self.error = error
+            print(f"Musique désactivée : {error}")
+            return
+        self.__pygame = pygame
+        self.ready_at = time.perf_counter()
+
+    def stop(self):
+        """
+        Arrête la musique et libère le mixeur.
+        """
+        if self.__thread is not None:
+            self.__thread.join(timeout=1.0)  # Un mixeur bloqué ne doit pas empêcher de quitter
+        if self.__pygame is not None:
+            self.__pygame.mixer.quit()
+            self.__pygame = None
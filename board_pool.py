@@ -0,0 +1,234 @@
+import argparse
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game_logic import Minesweeper, SaveError
+from solver import Solver
+
+# Difficultés proposées par l'interface : nom -> (lignes, colonnes, bombes)
+DIFFICULTIES = {
+    "facile": (9, 9, 10),
+    "moyen": (16, 16, 40),
+    "difficile": (20, 24, 99),
+}
+
+
+def start_cell(rows, columns):
+    """
+    Case de départ imposée des grilles « sans hasard » : le centre de la grille.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :return: Coordonnées (ligne, colonne).
+    """
+    return rows // 2, columns // 2
+
+
+def is_no_guess(game, rows, columns, bombs):
+    """
+    Vérifie qu'une partie se gagne sans jamais deviner depuis la case de départ : à chaque coup,
+    le solveur doit trouver une case dont la probabilité de bombe est nulle.
+    La partie est jouée (et donc modifiée) pendant la vérification.
+    :param game: Partie dont les bombes ne sont pas encore placées.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :return: True si la partie est gagnée sans deviner.
+    """
+    solver = Solver(game, rows, columns, bombs)
+    result, revealed = game.click_cell(*start_cell(rows, columns))
+    while result != "lost" and not game.is_won():
+        solver.update(revealed)
+        cell, probability = solver.hint()
+        if probability > 0:
+            return False
+        result, revealed = game.click_cell(*cell)
+    return result != "lost"
+
+
+def generate_no_guess(rows, columns, bombs, seed, max_attempts=1000):
+    """
+    Cherche une grille sans hasard en essayant les graines seed, seed + 1, ...
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param seed: Première graine essayée.
+    :param max_attempts: Nombre maximal de grilles essayées.
+    :return: Tuple (graine retenue, nombre d'essais), ou (None, max_attempts) en cas d'échec.
+    """
+    for attempt in range(max_attempts):
+        game = Minesweeper(rows, columns, bombs, seed=seed + attempt, safe_zone=True, verbose=False)
+        if is_no_guess(game, rows, columns, bombs):
+            return seed + attempt, attempt + 1
+    return None, max_attempts
+
+
+def new_board(rows, columns, bombs, seed):
+    """
+    Construit la partie (non commencée) correspondant à une graine retenue par generate_no_guess.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param seed: Graine de la grille.
+    :return: Partie dont les bombes sont placées autour de la case de départ, aucune case révélée.
+    """
+    game = Minesweeper(rows, columns, bombs, seed=seed, safe_zone=True, verbose=False)
+    game.generate(*start_cell(rows, columns))
+    return game
+
+
+class BoardPool:
+    def __init__(self, directory="board_cache", capacity=20, workers=None, max_attempts=1000):
+        """
+        Réserve de grilles sans hasard pré-générées en arrière-plan et gardées sur disque,
+        au format de savegame, dans un sous-dossier par difficulté.
+        :param directory: Dossier du cache.
+        :param capacity: Nombre maximal de grilles gardées par difficulté.
+        :param workers: Nombre de processus de génération (par défaut, le nombre de cœurs).
+        :param max_attempts: Nombre maximal de grilles essayées par tâche de génération.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.workers = workers or os.cpu_count() or 1
+        self.max_attempts = max_attempts
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def __folder(self, name):
+        """
+        Dossier du cache d'une difficulté, créé au besoin.
+        :param name: Nom de la difficulté.
+        """
+        folder = os.path.join(self.directory, name)
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def __files(self, name):
+        """
+        Liste les grilles en cache d'une difficulté, de la plus ancienne à la plus récente.
+        :param name: Nom de la difficulté.
+        """
+        folder = self.__folder(name)
+        paths = [os.path.join(folder, entry) for entry in os.listdir(folder) if entry.endswith(".msw")]
+        return sorted(paths, key=os.path.getmtime)
+
+    def available(self, name):
+        """
+        Nombre de grilles prêtes pour une difficulté.
+        :param name: Nom de la difficulté.
+        """
+        with self.__lock:
+            return len(self.__files(name))
+
+    def take(self, name):
+        """
+        Retire une grille prête du cache.
+        :param name: Nom de la difficulté.
+        :return: Tuple (partie, case de départ), ou None si aucune grille n'est prête.
+        """
+        from savegame import load_game  # Import différé : savegame charge numpy, inutile au démarrage
+
+        rows, columns, _ = DIFFICULTIES[name]
+        with self.__lock:
+            for path in self.__files(name):
+                try:
+                    game, _ = load_game(path)
+                except (OSError, SaveError):
+                    game = None  # Fichier abîmé : il est simplement supprimé
+                os.remove(path)
+                if game is not None:
+                    return game, start_cell(rows, columns)
+        return None
+
+    def __store(self, name, seed):
+        """
+        Écrit une grille dans le cache si la capacité le permet.
+        :param name: Nom de la difficulté.
+        :param seed: Graine de la grille.
+        """
+        from savegame import save_game  # Import différé : savegame charge numpy, inutile au démarrage
+
+        rows, columns, bombs = DIFFICULTIES[name]
+        with self.__lock:
+            if len(self.__files(name)) >= self.capacity:
+                return
+            path = os.path.join(self.__folder(name), f"{seed}.msw")
+            save_game(new_board(rows, columns, bombs, seed), path + ".tmp")
+            os.replace(path + ".tmp", path)  # Une grille n'est visible qu'une fois complète
+
+    def refill(self, names=None):
+        """
+        Complète le cache jusqu'à sa capacité, en répartissant la génération sur un pool de processus.
+        :param names: Difficultés à compléter (par défaut, toutes).
+        :return: Nombre de grilles ajoutées.
+        """
+        names = names or list(DIFFICULTIES)
+        missing = {name: self.capacity - self.available(name) for name in names}
+        if not any(count > 0 for count in missing.values()):
+            return 0
+
+        added = 0
+        # "spawn" : les processus ne doivent rien hériter de l'interface Tk du processus parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = {}
+            for name, count in missing.items():
+                rows, columns, bombs = DIFFICULTIES[name]
+                for _ in range(max(count, 0)):
+                    future = pool.submit(generate_no_guess, rows, columns, bombs, random.randrange(2 ** 32),
+                                         self.max_attempts)
+                    futures[future] = name
+            for future in as_completed(futures):
+                if self.__stop.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                seed, _ = future.result()
+                if seed is not None:
+                    self.__store(futures[future], seed)
+                    added += 1
+        return added
+
+    def refill_async(self, names=None):
+        """
+        Lance refill dans un fil d'exécution d'arrière-plan, si aucun n'est déjà en cours.
+        :param names: Difficultés à compléter (par défaut, toutes).
+        :return: Le fil d'exécution.
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.refill, args=(names,), daemon=True)
+            self.__thread.start()
+        return self.__thread
+
+    def stop(self):
+        """
+        Interrompt la génération en arrière-plan (les tâches déjà lancées sont abandonnées).
+        """
+        self.__stop.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-génère des grilles de démineur sans hasard.")
+    parser.add_argument("--directory", default="board_cache")
+    parser.add_argument("--capacity", type=int, default=20, help="Grilles gardées par difficulté")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("names", nargs="*", help=f"Difficultés à compléter parmi {', '.join(DIFFICULTIES)}")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(DIFFICULTIES)
+    if unknown:
+        parser.error(f"difficulté inconnue : {', '.join(sorted(unknown))}")
+
+    pool = BoardPool(args.directory, args.capacity, args.workers)
+    start = time.perf_counter()
+    added = pool.refill(args.names or None)
+    print(f"{added} grilles ajoutées en {time.perf_counter() - start:.1f} s")
+    for name in args.names or DIFFICULTIES:
+        print(f"    {name:<10} {pool.available(name)} prêtes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import tkinter as tk
+
+from game_logic import HIDDEN, FLAG
+
+HIDDEN_COLOR = "#D5D8DC"
+REVEALED_COLOR = "#FDFEFE"
+NUMBER_COLORS = {
+    "1": "#2E86C1", "2": "#229954", "3": "#CB4335", "4": "#1F618D",
+    "5": "#943126", "6": "#117A65", "7": "#17202A", "8": "#616A6B",
+}
+
+
+class CanvasBoard:
+    def __init__(self, parent, game, rows, columns, on_click, on_right_click, cell_size=24,
+                 max_width=900, max_height=650):
+        """
+        Affiche la grille du démineur sur un unique tk.Canvas défilant.
+        Seules les cases visibles sont dessinées, ce qui permet des grilles de plusieurs millions de cases.
+        :param parent: Widget Tkinter parent.
+        :param game: Partie en cours (Minesweeper ou ArrayMinesweeper).
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param on_click: Fonction appelée avec (événement, ligne, colonne) lors d'un clic gauche.
+        :param on_right_click: Fonction appelée avec (événement, ligne, colonne) lors d'un clic droit.
+        :param cell_size: Taille d'une case en pixels.
+        :param max_width: Largeur maximale de la zone visible en pixels.
+        :param max_height: Hauteur maximale de la zone visible en pixels.
+        """
+        self.game = game
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.on_click = on_click
+        self.on_right_click = on_right_click
+        self.__items = {}  # (ligne, colonne) -> (rectangle, texte) des cases dessinées
+        self.__viewport = None  # (première ligne, dernière ligne, première colonne, dernière colonne)
+
+        self.frame = tk.Frame(parent)
+        width = min(columns * cell_size, max_width)
+        height = min(rows * cell_size, max_height)
+        self.canvas = tk.Canvas(self.frame, width=width, height=height, bg=HIDDEN_COLOR, highlightthickness=0,
+                                scrollregion=(0, 0, columns * cell_size, rows * cell_size))
+        x_scroll = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.__xview)
+        y_scroll = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.__yview)
+        self.canvas.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Button-1>", lambda e: self.__dispatch(e, self.on_click))
+        self.canvas.bind("<Button-2>", lambda e: self.__dispatch(e, self.on_right_click))
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<MouseWheel>", self.__on_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", self.__on_wheel)
+
+    def grid(self, **kwargs):
+        """
+        Place le plateau dans son parent avec le gestionnaire grid.
+        """
+        self.frame.grid(**kwargs)
+
+    def __xview(self, *args):
+        """
+        Défilement horizontal commandé par la barre de défilement.
+        """
+        self.canvas.xview(*args)
+        self.redraw()
+
+    def __yview(self, *args):
+        """
+        Défilement vertical commandé par la barre de défilement.
+        """
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def __on_wheel(self, event):
+        """
+        Fait défiler la grille à la molette (horizontalement avec Shift).
+        :param event: Événement Tkinter.
+        """
+        step = -1 if event.delta > 0 else 1
+        if event.state & 0x0001:  # Shift
+            self.canvas.xview_scroll(step, "units")
+        else:
+            self.canvas.yview_scroll(step, "units")
+        self.redraw()
+
+    def __dispatch(self, event, callback):
+        """
+        Convertit la position d'un clic en case par simple calcul et transmet le clic.
+        :param event: Événement Tkinter.
+        :param callback: Fonction à appeler avec (événement, ligne, colonne).
+        """
+        row = int(self.canvas.canvasy(event.y)) // self.cell_size
+        col = int(self.canvas.canvasx(event.x)) // self.cell_size
+        if 0 <= row < self.rows and 0 <= col < self.columns:
+            callback(event, row, col)
+
+    def redraw(self):
+        """
+        Redessine les cases de la zone visible si celle-ci a changé depuis le dernier dessin.
+        """
+        size = self.cell_size
+        left = int(self.canvas.canvasx(0))
+        top = int(self.canvas.canvasy(0))
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+        viewport = (max(top // size, 0), min(bottom // size + 1, self.rows),
+                    max(left // size, 0), min(right // size + 1, self.columns))
+        if viewport == self.__viewport:
+            return
+
+        self.__viewport = viewport
+        self.canvas.delete("tile")
+        self.__items = {}
+        first_row, last_row, first_col, last_col = viewport
+        for i in range(first_row, last_row):
+            for j in range(first_col, last_col):
+                x, y = j * size, i * size
+                rect = self.canvas.create_rectangle(x, y, x + size, y + size, outline="#ABB2B9", tags="tile")
+                text = self.canvas.create_text(x + size // 2, y + size // 2, tags="tile")
+                self.__items[(i, j)] = (rect, text)
+                self.__paint(i, j)
+        self.canvas.tag_raise("highlight")
+
+    def update_cells(self, cells):
+        """
+        Redessine uniquement les cases modifiées qui sont actuellement visibles.
+        :param cells: Liste des coordonnées (ligne, colonne) modifiées.
+        """
+        for cell in cells:
+            if cell in self.__items:
+                self.__paint(*cell)
+
+    def highlight(self, row, col, color):
+        """
+        Encadre une case (par exemple pour un indice) ; un seul encadré est affiché à la fois.
+        :param row: Ligne de la cellule, ou None pour retirer l'encadré.
+        :param col: Colonne de la cellule.
+        :param color: Couleur de l'encadré.
+        """
+        self.canvas.delete("highlight")
+        if row is None:
+            return
+        size = self.cell_size
+        x, y = col * size, row * size
+        self.canvas.create_rectangle(x + 1, y + 1, x + size - 1, y + size - 1, outline=color, width=3,
+                                     tags="highlight")
+
+        # Fait défiler la vue jusqu'à la case si elle n'est pas visible
+        if self.__viewport is not None:
+            first_row, last_row, first_col, last_col = self.__viewport
+            if not first_row <= row < last_row:
+                self.canvas.yview_moveto(max(row - (last_row - first_row) // 2, 0) / self.rows)
+            if not first_col <= col < last_col:
+                self.canvas.xview_moveto(max(col - (last_col - first_col) // 2, 0) / self.columns)
+            self.redraw()
+
+    def __paint(self, row, col):
+        """
+        Met à jour la couleur et le texte d'une case dessinée.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        rect, text = self.__items[(row, col)]
+        value = self.game.get_cell(row, col)
+        hidden = value in (HIDDEN, FLAG)
+        self.canvas.itemconfig(rect, fill=HIDDEN_COLOR if hidden else REVEALED_COLOR)
+        self.canvas.itemconfig(text, text="" if value == "0" else value, fill=NUMBER_COLORS.get(value, "black"))
@@ -0,0 +1,139 @@
+import argparse
+import random
+import sys
+from itertools import combinations
+
+from game_logic import Minesweeper, HIDDEN, FLAG
+from solver import Solver
+
+TOLERANCE = 1e-9
+
+
+def exact_probabilities(game, rows, columns, bombs):
+    """
+    Probabilité de bombe de chaque case cachée, par énumération de toutes les répartitions
+    des bombes sur les cases cachées compatibles avec les chiffres affichés.
+    Réservé aux petites grilles : le coût croît comme C(cases cachées, bombes).
+    :param game: Partie observée.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre total de bombes.
+    :return: Dictionnaire (ligne, colonne) -> probabilité, pour chaque case cachée.
+    """
+    display = game.get_display_matrix()
+    hidden = [(i, j) for i in range(rows) for j in range(columns) if display[i][j] in (HIDDEN, FLAG)]
+    bit = {cell: 1 << k for k, cell in enumerate(hidden)}
+    constraints = []
+    for i in range(rows):
+        for j in range(columns):
+            if display[i][j] not in (HIDDEN, FLAG):
+                mask = 0
+                for di in (-1, 0, 1):
+                    for dj in (-1, 0, 1):
+                        mask |= bit.get((i + di, j + dj), 0)
+                constraints.append((mask, int(display[i][j])))
+
+    counts = [0] * len(hidden)
+    total = 0
+    for placement in combinations(range(len(hidden)), bombs):
+        mines = 0
+        for k in placement:
+            mines |= 1 << k
+        if all((mines & mask).bit_count() == value for mask, value in constraints):
+            total += 1
+            for k in placement:
+                counts[k] += 1
+    return {cell: count / total for cell, count in zip(hidden, counts)}
+
+
+def solver_probabilities(solver):
+    """
+    Probabilité de bombe de chaque case cachée selon le solveur.
+    :param solver: Instance de Solver.
+    :return: Fonction (ligne, colonne) -> probabilité.
+    """
+    safe, mines = solver.analyze()
+    frontier, sea = solver.probabilities()
+
+    def probability(cell):
+        if cell in mines:
+            return 1.0
+        if cell in safe:
+            return 0.0
+        return frontier.get(cell, sea)
+    return probability
+
+
+def compare(label, expected, probability):
+    """
+    Compare les probabilités du solveur aux probabilités exactes.
+    :param label: Description de la position, reprise dans les messages.
+    :param expected: Dictionnaire renvoyé par exact_probabilities.
+    :param probability: Fonction renvoyée par solver_probabilities.
+    :return: Liste des écarts, un message par case.
+    """
+    return [f"{label}, case {cell} : solveur {probability(cell):.6f}, attendu {value:.6f}"
+            for cell, value in expected.items() if abs(probability(cell) - value) > TOLERANCE]
+
+
+def check_board(rows, columns, bombs, seed):
+    """
+    Joue une partie sans jamais cliquer sur une bombe, en posant parfois un drapeau, et compare
+    après chaque coup le solveur reconstruit (resync) et le solveur mis à jour (update)
+    à l'énumération exhaustive.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param seed: Graine de la grille et des coups.
+    :return: Tuple (nombre de positions vérifiées, liste des écarts).
+    """
+    rng = random.Random(seed)
+    game = Minesweeper(rows, columns, bombs, seed=seed, verbose=False)
+    _, revealed = game.click_cell(rng.randrange(rows), rng.randrange(columns))
+    mines = game.export_state()["mines"]
+    incremental = Solver(game, rows, columns, bombs)
+    positions = 0
+    errors = []
+    while True:
+        label = f"{rows}x{columns}x{bombs}, graine {seed}, position {positions}"
+        expected = exact_probabilities(game, rows, columns, bombs)
+        errors += compare(label, expected, solver_probabilities(Solver(game, rows, columns, bombs)))
+        errors += compare(label + " (update)", expected, solver_probabilities(incremental))
+        positions += 1
+        if game.is_won():
+            return positions, errors
+        safe = [cell for cell in expected if not mines[cell[0] * columns + cell[1]]]
+        if rng.random() < 0.3:
+            game.toggle_flag(*rng.choice(list(expected)))
+        row, col = rng.choice(safe)
+        if game.get_cell(row, col) == FLAG:
+            game.toggle_flag(row, col)
+        _, revealed = game.click_cell(row, col)
+        incremental.update(revealed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Vérifie les probabilités du solveur par énumération exhaustive sur de petites grilles.")
+    parser.add_argument("--boards", type=int, default=200, help="Nombre de parties")
+    parser.add_argument("--rows", type=int, default=5)
+    parser.add_argument("--columns", type=int, default=5)
+    parser.add_argument("--bombs", type=int, nargs="+", default=[3, 4, 5], help="Nombres de bombes essayés")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    positions = 0
+    errors = []
+    for board in range(args.boards):
+        bombs = args.bombs[board % len(args.bombs)]
+        checked, found = check_board(args.rows, args.columns, bombs, args.seed + board)
+        positions += checked
+        errors += found
+    for error in errors[:20]:
+        print(error)
+    print(f"{args.boards} parties, {positions} positions vérifiées, {len(errors)} écarts")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
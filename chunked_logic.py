@@ -0,0 +1,258 @@
+import random
+import zlib
+from collections import OrderedDict, deque
+
+from game_logic import HIDDEN, FLAG
+
+REVEALED = 1  # Bit d'état : case révélée
+FLAGGED = 2  # Bit d'état : drapeau posé
+MINE = 9  # Valeur des bombes dans le tableau des chiffres d'un bloc
+
+
+class ChunkedMinesweeper:
+    def __init__(self, density=0.2, seed=None, chunk_size=64, max_chunks=256, max_reveal=100_000):
+        """
+        Démineur « infini » découpé en blocs carrés générés à la demande.
+        Chaque bloc est tiré d'une graine dérivée de la graine de la partie et de ses coordonnées,
+        si bien qu'il peut être oublié puis régénéré à l'identique. Au-delà de max_chunks blocs en
+        mémoire, le moins récemment utilisé est libéré (bloc intact) ou compressé (bloc déjà joué).
+        Les coordonnées (ligne, colonne) sont des entiers quelconques, éventuellement négatifs.
+        :param density: Proportion de bombes dans chaque bloc.
+        :param seed: Graine entière de la partie (tirée au hasard si None).
+        :param chunk_size: Côté d'un bloc, en cases.
+        :param max_chunks: Nombre maximal de blocs décompressés gardés en mémoire.
+        :param max_reveal: Nombre maximal de cases révélées par un clic (une faible densité peut
+                           produire des zones vides sans fin).
+        """
+        if not 0 <= density < 1:
+            raise ValueError(f"Densité de bombes invalide : {density}")
+        self.__density = density
+        self.__seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.__size = chunk_size
+        self.__max_chunks = max_chunks
+        self.__max_reveal = max_reveal
+        self.__bombs_per_chunk = round(density * chunk_size * chunk_size)
+        self.__chunks = OrderedDict()  # (bloc ligne, bloc colonne) -> [chiffres, état], ordre LRU
+        self.__frozen = {}  # (bloc ligne, bloc colonne) -> état compressé par zlib
+        self.__mine_cache = OrderedDict()  # (bloc ligne, bloc colonne) -> positions des bombes
+        self.__cleared = frozenset()  # Cases forcées sans bombe autour du premier clic
+        self.__first_click = True
+
+    def get_seed(self):
+        """
+        Retourne la graine de la partie.
+        :return: Graine entière.
+        """
+        return self.__seed
+
+    def __mines(self, chunk):
+        """
+        Tire les bombes d'un bloc à partir de la graine de la partie et des coordonnées du bloc.
+        :param chunk: Coordonnées (bloc ligne, bloc colonne).
+        :return: Ensemble des indices à plat (ligne * côté + colonne) des bombes du bloc.
+        """
+        mines = self.__mine_cache.get(chunk)
+        if mines is not None:
+            self.__mine_cache.move_to_end(chunk)
+            return mines
+
+        size = self.__size
+        rng = random.Random(f"{self.__seed}:{chunk[0]}:{chunk[1]}")
+        mines = set(rng.sample(range(size * size), self.__bombs_per_chunk))
+        for row, col in self.__cleared:
+            if (row // size, col // size) == chunk:
+                mines.discard((row % size) * size + col % size)
+
+        self.__mine_cache[chunk] = mines
+        if len(self.__mine_cache) > 4 * self.__max_chunks:
+            self.__mine_cache.popitem(last=False)
+        return mines
+
+    def __numbers(self, chunk):
+        """
+        Calcule les chiffres d'un bloc, en tenant compte des bombes des 8 blocs voisins sur ses bords.
+        :param chunk: Coordonnées (bloc ligne, bloc colonne).
+        :return: bytearray des chiffres (MINE pour une bombe), indexé à plat.
+        """
+        size = self.__size
+        width = size + 2
+        # Grille des bombes du bloc bordée d'une case prise dans les blocs voisins
+        padded = bytearray(width * width)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for index in self.__mines((chunk[0] + dx, chunk[1] + dy)):
+                    i, j = divmod(index, size)
+                    i += dx * size + 1
+                    j += dy * size + 1
+                    if 0 <= i < width and 0 <= j < width:
+                        padded[i * width + j] = 1
+
+        numbers = bytearray(size * size)
+        for i in range(size):
+            above, middle, below = (i * width, (i + 1) * width, (i + 2) * width)
+            for j in range(size):
+                if padded[middle + j + 1]:
+                    numbers[i * size + j] = MINE
+                else:
+                    numbers[i * size + j] = (
+                        padded[above + j] + padded[above + j + 1] + padded[above + j + 2]
+                        + padded[middle + j] + padded[middle + j + 2]
+                        + padded[below + j] + padded[below + j + 1] + padded[below + j + 2]
+                    )
+        return numbers
+
+    def __chunk(self, chunk, create=True):
+        """
+        Retourne un bloc décompressé, en le générant ou en le restaurant au besoin.
+        :param chunk: Coordonnées (bloc ligne, bloc colonne).
+        :param create: Si False, renvoie None pour un bloc jamais touché au lieu de le générer.
+        :return: Liste [chiffres, état] du bloc, ou None.
+        """
+        data = self.__chunks.get(chunk)
+        if data is not None:
+            self.__chunks.move_to_end(chunk)
+            return data
+
+        frozen = self.__frozen.pop(chunk, None)
+        if frozen is not None:
+            state = bytearray(zlib.decompress(frozen))
+        elif create:
+            state = bytearray(self.__size * self.__size)
+        else:
+            return None
+
+        # Les chiffres ne sont calculés qu'après le premier clic, qui fixe la zone dégagée
+        numbers = None if self.__first_click else self.__numbers(chunk)
+        data = [numbers, state]
+        self.__chunks[chunk] = data
+        self.__evict()
+        return data
+
+    def __evict(self):
+        """
+        Libère les blocs les moins récemment utilisés au-delà du budget mémoire : un bloc intact est
+        simplement oublié (il sera régénéré), un bloc déjà joué est compressé.
+        """
+        while len(self.__chunks) > self.__max_chunks:
+            chunk, (_, state) = self.__chunks.popitem(last=False)
+            if any(state):
+                self.__frozen[chunk] = zlib.compress(bytes(state))
+
+    def __locate(self, row, col):
+        """
+        Convertit des coordonnées globales en (bloc, indice à plat dans le bloc).
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        size = self.__size
+        return (row // size, col // size), (row % size) * size + col % size
+
+    def memory_usage(self):
+        """
+        Décrit l'occupation mémoire des blocs.
+        :return: Dictionnaire (blocs en mémoire, blocs compressés, octets compressés).
+        """
+        return {
+            "chunks": len(self.__chunks),
+            "frozen": len(self.__frozen),
+            "frozen_bytes": sum(len(data) for data in self.__frozen.values()),
+        }
+
+    def generate(self, first_click_row, first_click_col):
+        """
+        Fixe la zone sans bombe autour du premier clic (carré 3x3), si ce n'est pas déjà fait.
+        :param first_click_row: Ligne du premier clic.
+        :param first_click_col: Colonne du premier clic.
+        """
+        if not self.__first_click:
+            return
+        self.__cleared = frozenset(
+            (first_click_row + dx, first_click_col + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+        )
+        self.__mine_cache.clear()
+        self.__first_click = False
+        for chunk, data in self.__chunks.items():
+            data[0] = self.__numbers(chunk)
+
+    def click_cell(self, row, col):
+        """
+        Gère le clic sur une cellule ; la zone révélée peut s'étendre sur plusieurs blocs.
+        :param row: Ligne de la cellule cliquée.
+        :param col: Colonne de la cellule cliquée.
+        Au-delà de max_reveal cases, le remplissage s'arrête : les cases vides révélées à sa frontière
+        gardent des voisines cachées, et un clic sur l'une d'elles le poursuit.
+        :return: Tuple (résultat, cases révélées), comme game_logic.Minesweeper.click_cell.
+        """
+        chunk, index = self.__locate(row, col)
+        if self.__chunk(chunk)[1][index] & FLAGGED:
+            return "flagged", []
+
+        self.generate(row, col)
+
+        numbers, state = self.__chunk(chunk)
+        if numbers[index] == MINE:
+            return "lost", []
+        if state[index]:
+            if numbers[index] != 0:
+                return "continue", []
+            # Case vide déjà révélée : un remplissage interrompu par max_reveal reprend à partir d'elle
+            revealed = []
+            queue = deque([(row, col)])
+        else:
+            state[index] = REVEALED
+            revealed = [(row, col)]
+            queue = deque(revealed)
+        while queue and len(revealed) < self.__max_reveal:
+            i, j = queue.popleft()
+            chunk, index = self.__locate(i, j)
+            if self.__chunk(chunk)[0][index] != 0:
+                continue
+            for x in (i - 1, i, i + 1):
+                for y in (j - 1, j, j + 1):
+                    chunk, index = self.__locate(x, y)
+                    state = self.__chunk(chunk)[1]
+                    if not state[index]:
+                        state[index] = REVEALED
+                        revealed.append((x, y))
+                        queue.append((x, y))
+        return "continue", revealed
+
+    def toggle_flag(self, row, col):
+        """
+        Ajoute ou retire un drapeau sur une cellule spécifique.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        chunk, index = self.__locate(row, col)
+        state = self.__chunk(chunk)[1]
+        if state[index] == 0:
+            state[index] = FLAGGED
+        elif state[index] == FLAGGED:
+            state[index] = 0
+
+    def get_cell(self, row, col):
+        """
+        Retourne la valeur affichée d'une case ; un bloc jamais touché n'est pas généré pour autant.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        :return: Valeur affichée (chiffre, drapeau ou case cachée).
+        """
+        chunk, index = self.__locate(row, col)
+        data = self.__chunk(chunk, create=False)
+        if data is None:
+            return HIDDEN
+        numbers, state = data
+        if state[index] & REVEALED:
+            return str(numbers[index])
+        return FLAG if state[index] == FLAGGED else HIDDEN
+
+    def get_display_window(self, top, left, rows, columns):
+        """
+        Construit la matrice affichée d'une fenêtre rectangulaire du plateau.
+        :param top: Première ligne de la fenêtre.
+        :param left: Première colonne de la fenêtre.
+        :param rows: Nombre de lignes de la fenêtre.
+        :param columns: Nombre de colonnes de la fenêtre.
+        :return: Matrice affichée (liste de listes de chaînes).
+        """
+        return [[self.get_cell(i, j) for j in range(left, left + columns)] for i in range(top, top + rows)]
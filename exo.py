@@ -35,70 +35,506 @@ Lamech     - 188 / 753
 Noé        - 500 / 950
 """
 
+import argparse
+import csv
+import shutil
+import sys
+import tempfile
+from itertools import islice
 
-def age(dico):
-    for k, v in dico.items():
-        if "Enos" in k:
-            print(k , " est père à " ,  abs(v[0]) , "ans. Puis transféré à Dieu", abs(v[1]) )
-        else :
-            print(k , " est père à " ,  abs(v[0]) , "ans et meurt à ", abs(v[1]) , "ans")
+try:
+    import numpy as np
+except ImportError:  # numpy accélère seulement les conversions en bloc
+    np = None
 
-def moyenne(dico):
-    score_enfant = 0
-    score_mort = 0
-    for v in dico.values():
-        score_enfant += v[0]
-        score_mort += v[1]
-    return score_enfant // len(dico), score_mort // len(dico)
+JOURS_PAR_AN = 365  # Année solaire, unité de tous les résultats
 
-# Durée en années solaires entre la naissance d'Adam et la mort de Noé
-temps_ecoule_annees_solaires = 1450
+# Hypothèses : nombre de jours que compte une « année » des âges fournis
+HYPOTHESES = {
+    "lunaire": 28,  # Cycle lunaire
+    "nilotique": 125,  # Saison nilotique : 4 mois de 30 jours + 5 jours de fêtes
+    "solaire": 365,  # Année solaire
+}
+LIBELLES = {
+    "lunaire": "cycle lunaire de 28 jours",
+    "nilotique": "saison nilotique de 125 jours",
+    "solaire": "année solaire de 365 jours",
+}
+
+TRANSFERES = {"Énoch"}  # Patriarches qui ne sont pas morts mais transférés par Dieu
+LARGEUR_NOM = 10  # Largeur de la colonne des noms (« Mathusalem »)
+TAILLE_BLOC = 100_000  # Nombre de lignes traitées à la fois
+
+
+def convertir(peres, morts, hypotheses=tuple(HYPOTHESES)):
+    """
+    Convertit deux colonnes d'âges en années solaires selon plusieurs hypothèses, en une seule passe.
+    :param peres: Âges à la naissance de l'enfant, dans l'unité de l'hypothèse.
+    :param morts: Âges à la mort, dans l'unité de l'hypothèse.
+    :param hypotheses: Noms des hypothèses (clés de HYPOTHESES).
+    :return: Dictionnaire hypothèse -> (âges pères, âges morts) en années solaires.
+    """
+    facteurs = [HYPOTHESES[nom] / JOURS_PAR_AN for nom in hypotheses]
+    if np is not None:
+        # Tableau (hypothèses, 2, personnes) obtenu par un seul produit diffusé
+        resultats = np.array(facteurs)[:, None, None] * np.array([peres, morts], dtype=float)
+        return {nom: (resultats[k, 0], resultats[k, 1]) for k, nom in enumerate(hypotheses)}
+    return {nom: ([age * facteur for age in peres], [age * facteur for age in morts])
+            for nom, facteur in zip(hypotheses, facteurs)}
+
+
+class Statistiques:
+    def __init__(self):
+        """
+        Cumule, bloc après bloc, les sommes nécessaires aux moyennes et à la durée totale.
+        Les sommes sont gardées dans l'unité des données : une conversion n'est qu'un facteur.
+        La durée suppose que les lignes suivent la descendance (chaque patriarche est le père du suivant).
+        """
+        self.nombre = 0
+        self.nombre_morts = 0  # Les transférés n'entrent pas dans la moyenne des âges de mort
+        self.somme_peres = 0.0
+        self.somme_morts = 0.0
+        self.dernier = None  # (âge père, âge mort) de la dernière ligne lue
+
+    def ajouter(self, peres, morts, transferes):
+        """
+        Ajoute un bloc de lignes.
+        :param peres: Âges à la naissance de l'enfant.
+        :param morts: Âges à la mort (ou au transfert).
+        :param transferes: Booléens : True si le patriarche a été transféré par Dieu.
+        """
+        if not len(peres):
+            return
+        if np is not None:
+            vivants = ~np.asarray(transferes, dtype=bool)
+            morts_tableau = np.asarray(morts, dtype=float)
+            self.somme_peres += float(np.sum(peres))
+            self.somme_morts += float(np.sum(morts_tableau[vivants]))
+            self.nombre_morts += int(np.count_nonzero(vivants))
+        else:
+            self.somme_peres += sum(peres)
+            self.somme_morts += sum(mort for mort, transfere in zip(morts, transferes) if not transfere)
+            self.nombre_morts += transferes.count(False)
+        self.nombre += len(peres)
+        self.dernier = (peres[-1], morts[-1])
+
+    def moyennes(self, hypothese="solaire"):
+        """
+        Âges moyens à la naissance de l'enfant et à la mort.
+        :param hypothese: Nom de l'hypothèse.
+        :return: Tuple (moyenne pères, moyenne morts) en années solaires.
+        """
+        facteur = HYPOTHESES[hypothese] / JOURS_PAR_AN
+        return (facteur * self.somme_peres / max(self.nombre, 1),
+                facteur * self.somme_morts / max(self.nombre_morts, 1))
+
+    def duree(self, hypothese="solaire"):
+        """
+        Temps écoulé entre la naissance du premier patriarche et la mort du dernier :
+        somme des âges de paternité de tous sauf le dernier, plus l'âge de mort du dernier.
+        :param hypothese: Nom de l'hypothèse.
+        :return: Durée en années solaires.
+        """
+        if self.dernier is None:
+            return 0.0
+        pere, mort = self.dernier
+        return HYPOTHESES[hypothese] / JOURS_PAR_AN * (self.somme_peres - pere + mort)
+
+
+def blocs_dico(dico):
+    """
+    Présente un dictionnaire nom -> [âge père, âge mort] comme un unique bloc.
+    :param dico: Données des patriarches.
+    :return: Itérateur sur des tuples (noms, pères, morts, transférés).
+    """
+    noms = list(dico)
+    yield (noms, [dico[nom][0] for nom in noms], [dico[nom][1] for nom in noms],
+           [nom in TRANSFERES for nom in noms])
+
+
+def lire_csv(chemin, taille_bloc=TAILLE_BLOC):
+    """
+    Lit un fichier CSV de généalogie par blocs, sans le charger en entier.
+    Colonnes attendues (avec une ligne d'en-tête) : nom, pere, mort et, facultative, transfere (1 ou 0).
+    L'en-tête est vérifié dès l'appel : un fichier vide ou incomplet lève ValueError avant toute lecture.
+    :param chemin: Chemin du fichier.
+    :param taille_bloc: Nombre de lignes par bloc.
+    :return: Itérateur sur des tuples (noms, pères, morts, transférés).
+    """
+    fichier = open(chemin, newline="", encoding="utf-8")
+    try:
+        lecteur = csv.reader(fichier)
+        entete = next(lecteur, None)
+        if entete is None:
+            raise ValueError(f"{chemin} : fichier vide, en-tête nom,pere,mort attendu")
+        manquantes = [nom for nom in ("nom", "pere", "mort") if nom not in entete]
+        if manquantes:
+            raise ValueError(f"{chemin} : colonne(s) {', '.join(manquantes)} absente(s) de l'en-tête")
+    except BaseException:
+        fichier.close()
+        raise
+    return _blocs_csv(chemin, fichier, lecteur, entete, taille_bloc)
+
+
+def _blocs_csv(chemin, fichier, lecteur, entete, taille_bloc):
+    """
+    Découpe en blocs les lignes d'un CSV dont l'en-tête a été vérifié par lire_csv, puis ferme le fichier.
+    """
+    colonne_nom, colonne_pere, colonne_mort = (entete.index(nom) for nom in ("nom", "pere", "mort"))
+    colonne_transfere = entete.index("transfere") if "transfere" in entete else None
+    largeur = max(colonne for colonne in (colonne_nom, colonne_pere, colonne_mort, colonne_transfere)
+                  if colonne is not None) + 1
+    with fichier:
+        for lignes in iter(lambda: list(islice(lecteur, taille_bloc)), []):
+            lignes = [ligne for ligne in lignes if ligne]  # Lignes vides ignorées
+            if not lignes:
+                continue
+            if min(map(len, lignes)) < largeur:
+                # La transposition tronquerait silencieusement tout le bloc à la ligne la plus courte
+                courte = next(ligne for ligne in lignes if len(ligne) < largeur)
+                raise ValueError(f"{chemin} : ligne {courte!r} incomplète, {largeur} colonnes attendues")
+            colonnes = list(zip(*lignes))  # Transposition du bloc : une liste par colonne
+            noms = list(colonnes[colonne_nom])
+            if colonne_transfere is None:
+                transferes = [nom in TRANSFERES for nom in noms]
+            else:
+                transferes = [valeur in ("1", "oui") or nom in TRANSFERES
+                              for nom, valeur in zip(noms, colonnes[colonne_transfere])]
+            try:
+                peres, morts = list(map(float, colonnes[colonne_pere])), list(map(float, colonnes[colonne_mort]))
+            except ValueError as erreur:
+                raise ValueError(f"{chemin} : {erreur}") from None
+            yield noms, peres, morts, transferes
+
+
+def lignes_rapport(noms, peres, morts, transferes, largeur=LARGEUR_NOM):
+    """
+    Met en forme une phrase alignée par patriarche.
+    :param noms: Noms des patriarches.
+    :param peres: Âges à la naissance de l'enfant, en années solaires.
+    :param morts: Âges à la mort, en années solaires.
+    :param transferes: Booléens : True si le patriarche a été transféré par Dieu.
+    :param largeur: Largeur de la colonne des noms.
+    :return: Liste des lignes, sans retour à la ligne.
+    """
+    if np is not None:
+        peres, morts = np.asarray(peres).tolist(), np.asarray(morts).tolist()  # Flottants Python, plus rapides à formater
+    return [
+        f"{nom:<{largeur}} est père à {pere:6.2f} ans et "
+        + (f"est transféré par Dieu à {mort:6.2f} ans" if transfere else f"meurt à {mort:6.2f} ans")
+        for nom, pere, mort, transfere in zip(noms, peres, morts, transferes)
+    ]
+
+
+def rapport(blocs, sorties, largeur=LARGEUR_NOM):
+    """
+    Convertit et met en forme les données bloc par bloc, en cumulant les statistiques dans la même passe.
+    Chaque bloc est écrit d'un seul appel à write.
+    :param blocs: Itérateur sur des tuples (noms, pères, morts, transférés), voir blocs_dico et lire_csv.
+    :param sorties: Dictionnaire hypothèse -> fichier texte recevant le rapport de cette hypothèse.
+    :param largeur: Largeur de la colonne des noms.
+    :return: Statistiques cumulées.
+    """
+    statistiques = Statistiques()
+    for noms, peres, morts, transferes in blocs:
+        statistiques.ajouter(peres, morts, transferes)
+        for hypothese, (peres_solaires, morts_solaires) in convertir(peres, morts, tuple(sorties)).items():
+            lignes = lignes_rapport(noms, peres_solaires, morts_solaires, transferes, largeur)
+            sorties[hypothese].write("\n".join(lignes) + "\n")
+    return statistiques
+
+
+def resume(statistiques):
+    """
+    Met en forme les moyennes et la durée totale selon les 3 hypothèses.
+    :param statistiques: Statistiques cumulées par rapport.
+    :return: Texte du résumé.
+    """
+    lignes = ["En moyenne :"]
+    for hypothese, libelle in LIBELLES.items():
+        pere, mort = statistiques.moyennes(hypothese)
+        lignes.append(f"    {libelle:<30} père à {pere:6.2f} ans, mort à {mort:6.2f} ans")
+    lignes.append("Durée entre la naissance du premier et la mort du dernier :")
+    for hypothese, libelle in LIBELLES.items():
+        lignes.append(f"    {libelle:<30} {statistiques.duree(hypothese):8.2f} années solaires")
+    return "\n".join(lignes)
+
+
+def age(dico, hypothese="solaire", sortie=None):
+    """
+    Écrit l'âge de chaque patriarche à la naissance de son enfant et à sa mort.
+    :param dico: Données des patriarches : nom -> [âge père, âge mort].
+    :param hypothese: Nom de l'hypothèse.
+    :param sortie: Fichier texte (par défaut, la sortie standard).
+    """
+    rapport(blocs_dico(dico), {hypothese: sortie or sys.stdout})
 
-# Hypothèse 1 : Conversion en années lunaires (cycle de 28 jours)
-jours_par_annee_solaire = 365
-jours_par_cycle_lunaire = 28
 
-# Calcul des années lunaires
-annees_lunaires = (temps_ecoule_annees_solaires * jours_par_annee_solaire) / jours_par_cycle_lunaire
+def moyenne(dico, hypothese="solaire"):
+    """
+    Âges moyens des patriarches à la naissance de leur enfant et à leur mort.
+    :param dico: Données des patriarches : nom -> [âge père, âge mort].
+    :param hypothese: Nom de l'hypothèse.
+    :return: Tuple (moyenne pères, moyenne morts) en années solaires.
+    """
+    statistiques = Statistiques()
+    for _, peres, morts, transferes in blocs_dico(dico):
+        statistiques.ajouter(peres, morts, transferes)
+    return statistiques.moyennes(hypothese)
 
-# Hypothèse 2 : Année nilotique (365 jours, divisé en 3 saisons et 5 jours de fête)
-annees_nilotiques = temps_ecoule_annees_solaires  # Pas de conversion nécessaire
 
-# Hypothèse 3 : Année solaire (365 jours)
-annees_solaires = temps_ecoule_annees_solaires  # Pas de conversion nécessaire
+INFINI = float("inf")
+
+
+class ArbreMinimum:
+    def __init__(self, valeurs):
+        """
+        Arbre de segments des minimums : retrouve toutes les valeurs inférieures à un seuil dans un
+        intervalle de positions en O((k + 1) log n) pour k résultats.
+        :param valeurs: Valeurs indexées par position.
+        """
+        self.taille = 1
+        while self.taille < len(valeurs):
+            self.taille *= 2
+        self.arbre = [INFINI] * (2 * self.taille)
+        self.arbre[self.taille:self.taille + len(valeurs)] = valeurs
+        for noeud in range(self.taille - 1, 0, -1):
+            self.arbre[noeud] = min(self.arbre[2 * noeud], self.arbre[2 * noeud + 1])
+
+    def inferieurs(self, debut, fin, seuil):
+        """
+        Positions de [debut, fin[ dont la valeur est strictement inférieure au seuil, dans l'ordre.
+        :param debut: Première position.
+        :param fin: Position suivant la dernière.
+        :param seuil: Seuil strict.
+        :return: Itérateur sur les positions.
+        """
+        arbre = self.arbre
+        pile = [(1, 0, self.taille)]
+        while pile:
+            noeud, bas, haut = pile.pop()
+            if haut <= debut or bas >= fin or arbre[noeud] >= seuil:
+                continue
+            if noeud >= self.taille:
+                yield noeud - self.taille
+            else:
+                milieu = (bas + haut) // 2
+                pile.append((2 * noeud + 1, milieu, haut))
+                pile.append((2 * noeud, bas, milieu))
+
+
+class Genealogie:
+    def __init__(self, noms, parents, naissances, morts, transferes=None):
+        """
+        Modèle des vies d'un arbre généalogique, en années absolues.
+        Un parcours en profondeur numérote les personnes de sorte que les descendants de chacune
+        occupent un intervalle contigu [entree, sortie[ ; des arbres de segments sur les naissances et
+        les morts répondent ensuite aux questions de chevauchement sans comparer toutes les paires.
+        :param noms: Noms des personnes.
+        :param parents: Indice du parent de chaque personne, -1 pour une racine.
+        :param naissances: Année de naissance de chaque personne.
+        :param morts: Année de mort (ou de transfert) de chaque personne.
+        :param transferes: Booléens : True pour une personne transférée par Dieu, qui n'est donc pas morte.
+        """
+        nombre = len(noms)
+        self.noms = list(noms)
+        self.parents = list(parents)
+        self.naissances = list(naissances)
+        self.morts = list(morts)
+        self.transferes = list(transferes) if transferes is not None else [False] * nombre
+        self.indices = {nom: i for i, nom in enumerate(self.noms)}
+
+        enfants = [[] for _ in range(nombre)]
+        for i, parent in enumerate(self.parents):
+            if parent >= 0:
+                enfants[parent].append(i)
+        # Parcours en profondeur itératif : une lignée peut compter des centaines de milliers de générations
+        self.ordre = []
+        self.entree = [0] * nombre
+        pile = [i for i in reversed(range(nombre)) if self.parents[i] < 0]
+        while pile:
+            i = pile.pop()
+            self.entree[i] = len(self.ordre)
+            self.ordre.append(i)
+            pile.extend(reversed(enfants[i]))
+        if len(self.ordre) != nombre:
+            raise ValueError("Les liens de parenté forment un cycle")
+        descendance = [1] * nombre
+        for i in reversed(self.ordre):
+            if self.parents[i] >= 0:
+                descendance[self.parents[i]] += descendance[i]
+        self.sortie = [self.entree[i] + descendance[i] for i in range(nombre)]
+
+        self.__arbre_naissances = ArbreMinimum([self.naissances[i] for i in self.ordre])
+        # Un transféré n'est pas mort : personne ne l'a vu mourir
+        self.__arbre_morts = ArbreMinimum([INFINI if self.transferes[i] else self.morts[i] for i in self.ordre])
+
+    @classmethod
+    def depuis_lignee(cls, noms, peres, morts, transferes=None):
+        """
+        Construit la généalogie d'une lignée où chaque personne est l'enfant de la précédente,
+        à partir des âges de paternité et de mort ; l'année 0 est la naissance de la première.
+        Toutes les hypothèses de calendrier multiplient les âges par un même facteur :
+        les réponses ne dépendent donc pas de l'hypothèse choisie.
+        :param noms: Noms, du plus ancien au plus récent.
+        :param peres: Âges à la naissance de l'enfant suivant.
+        :param morts: Âges à la mort.
+        :param transferes: Booléens : True pour une personne transférée par Dieu.
+        """
+        naissances = [0.0] * len(noms)
+        for i in range(1, len(noms)):
+            naissances[i] = naissances[i - 1] + peres[i - 1]
+        return cls(noms, range(-1, len(noms) - 1), naissances,
+                   [naissance + age for naissance, age in zip(naissances, morts)], transferes)
+
+    def __indice(self, personne):
+        """
+        Indice d'une personne désignée par son indice ou par son nom.
+        """
+        return personne if isinstance(personne, int) else self.indices[personne]
+
+    def descendants_connus(self, personne):
+        """
+        Descendants nés du vivant d'une personne.
+        :param personne: Nom ou indice de la personne.
+        :return: Noms des descendants, dans l'ordre du parcours.
+        """
+        i = self.__indice(personne)
+        positions = self.__arbre_naissances.inferieurs(self.entree[i] + 1, self.sortie[i], self.morts[i])
+        return [self.noms[self.ordre[position]] for position in positions]
+
+    def descendants_vus_mourir(self, personne):
+        """
+        Descendants morts avant une personne.
+        :param personne: Nom ou indice de la personne.
+        :return: Noms des descendants, dans l'ordre du parcours.
+        """
+        i = self.__indice(personne)
+        positions = self.__arbre_morts.inferieurs(self.entree[i] + 1, self.sortie[i], self.morts[i])
+        return [self.noms[self.ordre[position]] for position in positions]
+
+    def enfants_vus_mourir(self):
+        """
+        Couples (parent, enfant) où le parent a survécu à son enfant.
+        :return: Liste de tuples de noms.
+        """
+        return [(self.noms[parent], self.noms[i]) for i, parent in enumerate(self.parents)
+                if parent >= 0 and not self.transferes[i] and self.morts[i] < self.morts[parent]]
+
+    def __compter(self, valeurs):
+        """
+        Compte pour chaque personne ses descendants dont la valeur est inférieure à l'année de sa mort,
+        par un balayage des seuils croissants et un arbre de Fenwick sur les positions : O(n log n).
+        :param valeurs: Valeur (naissance ou mort) de chaque personne.
+        """
+        nombre = len(self.noms)
+        fenwick = [0] * (nombre + 1)
+
+        def prefixe(position):
+            total = 0
+            while position > 0:
+                total += fenwick[position]
+                position -= position & -position
+            return total
+
+        points = sorted(range(nombre), key=valeurs.__getitem__)
+        comptes = [0] * nombre
+        suivant = 0
+        for i in sorted(range(nombre), key=self.morts.__getitem__):
+            while suivant < nombre and valeurs[points[suivant]] < self.morts[i]:
+                position = self.entree[points[suivant]] + 1
+                while position <= nombre:
+                    fenwick[position] += 1
+                    position += position & -position
+                suivant += 1
+            comptes[i] = prefixe(self.sortie[i]) - prefixe(self.entree[i] + 1)
+        return comptes
+
+    def compter_descendants_connus(self):
+        """
+        Nombre de descendants connus de chaque personne, en une seule passe pour tout l'arbre.
+        :return: Dictionnaire nom -> nombre.
+        """
+        return dict(zip(self.noms, self.__compter(self.naissances)))
+
+    def compter_descendants_vus_mourir(self):
+        """
+        Nombre de descendants que chaque personne a vus mourir, en une seule passe pour tout l'arbre.
+        :return: Dictionnaire nom -> nombre.
+        """
+        morts = [INFINI if transfere else mort for mort, transfere in zip(self.morts, self.transferes)]
+        return dict(zip(self.noms, self.__compter(morts)))
 
 
 def mort(dico):
-    Liste = []
-    # Récupération des clés pour parcourir le dictionnaire
-    cles = list(dico.keys())
-
-    # Comparaison directe des valeurs avec les clés du dico
-    for i in range(len(cles) - 1):
-        cle_actuelle = cles[i]
-        cle_suivante = cles[i + 1]
-        if cle_actuelle < cle_suivante:
-            Liste.append(cle_actuelle)
-    return Liste
+    """
+    Patriarches qui ont vu la mort de leur enfant.
+    :param dico: Données des patriarches, dans l'ordre de la lignée : nom -> [âge père, âge mort].
+    :return: Liste des noms.
+    """
+    genealogie = Genealogie.depuis_lignee(*next(blocs_dico(dico)))
+    return [parent for parent, _ in genealogie.enfants_vus_mourir()]
+
 
 dico = {
-    "Adam" : [-230,930],
-    "Seth" : [-210,430],
-    "Enos" : [-190,90],
-    "Caïnan" : [-170,90],
-    "Malalehel" : [-165,895],
-    "Jared" : [-162,962],
-    "Mathusalem" : [-167,969],
-    "Lamech" : [-188,753],
-    "Noé" : [-500,950]
+    "Adam": [230, 930],
+    "Seth": [205, 912],
+    "Enos": [190, 905],
+    "Caïnan": [170, 910],
+    "Malalehel": [165, 895],
+    "Jared": [162, 962],
+    "Énoch": [165, 365],
+    "Mathusalem": [167, 969],
+    "Lamech": [188, 753],
+    "Noé": [500, 950],
 }
-age(dico)
-print("")
-print("La moyenne : " , moyenne(dico))
-print("")
-# Affichage des résultats
-print("Durée entre la naissance d'Adam et la mort de Noé selon différentes hypothèses :")
-print(f"1. En années lunaires (28 jours) : {annees_lunaires:.2f} années lunaires")
-print(f"2. En années nilotiques (365 jours) : {annees_nilotiques} années nilotiques")
-print(f"3. En années solaires (365 jours) : {annees_solaires} années solaires")
-print(mort(dico))
\ No newline at end of file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Âges des patriarches selon 3 hypothèses de calendrier.")
+    parser.add_argument("csv", nargs="?", help="Généalogie au format CSV (nom,pere,mort[,transfere]) ; "
+                                               "par défaut, les données de l'exercice")
+    parser.add_argument("--hypothese", choices=sorted(HYPOTHESES), action="append",
+                        help="Hypothèse à détailler (répétable, défaut : les 3)")
+    args = parser.parse_args(argv)
+
+    hypotheses = args.hypothese or list(HYPOTHESES)
+    try:
+        blocs = lire_csv(args.csv) if args.csv else blocs_dico(dico)
+    except (OSError, ValueError) as erreur:
+        parser.error(str(erreur))
+    sortie = sys.stdout
+    try:
+        if len(hypotheses) == 1:
+            statistiques = rapport(blocs, {hypotheses[0]: sortie})
+        else:
+            # Un seul passage sur les données : chaque hypothèse est écrite dans son propre fichier temporaire
+            # sur disque, recopié ensuite par morceaux, pour que la mémoire ne dépende pas de la taille des données
+            tampons = {hypothese: tempfile.TemporaryFile("w+", encoding="utf-8") for hypothese in hypotheses}
+            try:
+                statistiques = rapport(blocs, tampons)
+                for hypothese in hypotheses:
+                    sortie.write(f"--- Hypothèse : {LIBELLES[hypothese]} ---\n")
+                    tampons[hypothese].seek(0)
+                    shutil.copyfileobj(tampons[hypothese], sortie)
+            finally:
+                for tampon in tampons.values():
+                    tampon.close()
+    except ValueError as erreur:  # Ligne incomplète ou valeur non numérique dans le CSV
+        parser.error(str(erreur))
+    sortie.write(resume(statistiques) + "\n")
+    if args.csv:
+        return
+
+    genealogie = Genealogie.depuis_lignee(*next(blocs_dico(dico)))
+    lignes = ["Ont vu la mort de leur enfant : " + (", ".join(mort(dico)) or "aucun"), "Descendants connus :"]
+    for nom in genealogie.noms:
+        lignes.append(f"    {nom:<{LARGEUR_NOM}} {', '.join(genealogie.descendants_connus(nom)) or '-'}")
+    lignes.append("Descendants vus mourir :")
+    for nom in genealogie.noms:
+        lignes.append(f"    {nom:<{LARGEUR_NOM}} {', '.join(genealogie.descendants_vus_mourir(nom)) or '-'}")
+    sortie.write("\n".join(lignes) + "\n")
+
+
+if __name__ == "__main__":
+    main()
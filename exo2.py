@@ -1,16 +1,8 @@
-#-------------------------------------------
-# Programme principal
-#-------------------------------------------
-
-# !!! utilisez bien ma_var pour stocker le résultat de vos opérations !!!!
-
-# Inversion d'une chaîne de caractères
-ma_var = "Arcreane"
-ma_new_var = ""
-for i in range(len(ma_var) - 1, -1, -1):
-    ma_new_var += ma_var[i]
-ma_var = ma_new_var
-print(ma_var)
+import argparse
+import random
+import sys
+import time
+from collections import Counter
 
 #-------------------------------------------
 # Comptage d'occurrences dans une liste
@@ -25,61 +17,214 @@ def nb_occurence(x):
             score += 1
     return score
 
-print(nb_occurence(53))
+#-------------------------------------------
+# Index des occurrences : un seul parcours, puis chaque comptage en temps constant
+#-------------------------------------------
+
+class IndexOccurrences:
+    """
+    Nombre d'occurrences de chaque valeur, construit en un seul parcours et tenu à jour
+    à chaque ajout ou retrait.
+    """
+
+    def __init__(self, valeurs=()):
+        # valeurs peut être un itérateur (générateur, fichier...) : il est consommé sans être gardé en liste
+        self.__compteur = Counter(valeurs)  # Valeur -> nombre d'occurrences (jamais nul)
+        self.__taille = sum(self.__compteur.values())
+
+    @classmethod
+    def depuis_fichier(cls, chemin, conversion=int):
+        """
+        Construit l'index d'un fichier d'une valeur par ligne, lu au fil de l'eau sans être chargé en liste.
+        """
+        with open(chemin, encoding="utf-8") as fichier:
+            return cls(conversion(ligne) for ligne in fichier if ligne.strip())
+
+    def __len__(self):
+        return self.__taille
+
+    def compter(self, x):
+        """
+        Nombre d'occurrences de x, comme nb_occurence(x).
+        """
+        return self.__compteur[x]
+
+    def compter_lot(self, valeurs):
+        """
+        Nombres d'occurrences de plusieurs valeurs, dans l'ordre demandé.
+        """
+        return list(map(self.__compteur.__getitem__, valeurs))
+
+    def plus_frequentes(self, n):
+        """
+        Les n valeurs les plus fréquentes, sous forme de couples (valeur, occurrences).
+        """
+        return self.__compteur.most_common(n)
+
+    def ajouter(self, x):
+        self.__compteur[x] += 1
+        self.__taille += 1
+
+    def ajouter_lot(self, valeurs):
+        lot = Counter(valeurs)  # Accepte aussi un itérateur : rien n'est gardé en liste
+        self.__compteur.update(lot)
+        self.__taille += sum(lot.values())
+
+    def retirer(self, x):
+        """
+        Retire une occurrence de x ; ValueError si x est absent, comme list.remove.
+        """
+        nombre = self.__compteur.get(x, 0)
+        if nombre == 0:
+            raise ValueError(f"{x!r} n'est pas dans l'index")
+        if nombre == 1:
+            del self.__compteur[x]
+        else:
+            self.__compteur[x] = nombre - 1
+        self.__taille -= 1
+
+
+def banc_occurrences(taille=10_000_000, graine=0):
+    """
+    Compare nb_occurence (un parcours complet par valeur) à l'index sur une liste de taille éléments.
+    """
+    global ma_liste
+    generateur = random.Random(graine)
+    grande_liste = [generateur.choice(ma_liste) for _ in range(taille)]
+    valeurs = sorted(set(ma_liste))
+
+    liste_exercice, ma_liste = ma_liste, grande_liste
+    try:
+        debut = time.perf_counter()
+        attendu = [nb_occurence(x) for x in valeurs]
+        duree_parcours = time.perf_counter() - debut
+    finally:
+        ma_liste = liste_exercice
+
+    debut = time.perf_counter()
+    index = IndexOccurrences(grande_liste)
+    duree_construction = time.perf_counter() - debut
+    debut = time.perf_counter()
+    obtenu = index.compter_lot(valeurs)
+    duree_lot = time.perf_counter() - debut
+    assert obtenu == attendu
+
+    print(f"{taille} éléments, {len(valeurs)} valeurs distinctes :")
+    print(f"    nb_occurence       {duree_parcours:8.3f} s")
+    print(f"    index : création   {duree_construction:8.3f} s, comptage du lot {duree_lot * 1e6:8.1f} µs")
+
 
 #-------------------------------------------
 # Dessin d'un tapis avec une diagonale inversée
 #-------------------------------------------
 
-# Demande de la taille du tapis
-print("Please enter the size you want your carpet to be : ")
-size = int(input())
+def ligne_tapis(size, k, dieses=None):
+    """
+    Ligne k du tapis (0 : bordure supérieure), retour à la ligne compris.
+    Chaque ligne du milieu est faite de deux morceaux de "#" autour du trou de la diagonale inversée.
+    """
+    if k == 0 or k == max(size, 1):
+        return "+" + "-" * size + "+\n"
+    dieses = dieses or "#" * size  # Morceau le plus long, dont les deux côtés sont des tranches
+    i = k - 1
+    return "|" + dieses[:size - i - 1] + " " + dieses[:i] + "|\n"
+
+
+def position_ligne(size, k):
+    """
+    Position en octets du début de la ligne k : toutes les lignes ont size + 3 caractères ASCII,
+    ce qui permet d'écrire des tranches de lignes en parallèle dans un même fichier.
+    """
+    return k * (size + 3)
+
+
+def ecrire_tapis(size, sortie=None, debut=0, fin=None, taille_tampon=1 << 20):
+    """
+    Écrit les lignes debut à fin (exclue) du tapis dans un fichier texte, par blocs d'environ
+    taille_tampon caractères. Par défaut, tout le tapis (max(size, 1) + 1 lignes) sur la sortie standard.
+    """
+    sortie = sortie or sys.stdout
+    nombre_lignes = max(size, 1) + 1
+    fin = nombre_lignes if fin is None else min(fin, nombre_lignes)
+    dieses = "#" * size
+    lignes_par_bloc = max(taille_tampon // (size + 3), 1)
+    for bloc in range(debut, fin, lignes_par_bloc):
+        sortie.write("".join(ligne_tapis(size, k, dieses) for k in range(bloc, min(bloc + lignes_par_bloc, fin))))
+
 
 def draw_carpet(size):
-    # Impression de la bordure supérieure
-    print("+" + "-" * size + "+")
-
-    # Contenu du tapis avec la diagonale
-    for i in range(size - 1):
-        line = "|"
-        for j in range(size):
-            if j == size - i - 1:  # Diagonale inversée
-                line += " "
-            else:
-                line += "#"
-        line += "|"
-        print(line)
-
-    # Impression de la bordure inférieure
-    print("+" + "-" * size + "+")
-
-# Test de la fonction
-draw_carpet(size)
+    # Impression du tapis entier, bordures comprises, par grands blocs
+    ecrire_tapis(size)
 
 #-------------------------------------------
-# Génération de listes
+# Programme principal
 #-------------------------------------------
 
-# Liste de 1 à 6
-My_List = [i for i in range(1, 7)]
-print(My_List)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exercices : chaînes, occurrences, tapis et listes.")
+    parser.add_argument("--bench", action="store_true",
+                        help="Lance seulement le banc d'essai de l'index des occurrences")
+    parser.add_argument("--taille", type=int, default=10_000_000, help="Nombre d'éléments du banc d'essai")
+    args = parser.parse_args(argv)
+    if args.bench:
+        banc_occurrences(args.taille)
+        return
 
-# Liste des nombres impairs
-My_List_impair = [x for x in My_List if x % 2 == 1]
-print(My_List_impair)
+    # !!! utilisez bien ma_var pour stocker le résultat de vos opérations !!!!
 
-#-------------------------------------------
-# Création d'un mot à partir de deux variables
-#-------------------------------------------
+    # Inversion d'une chaîne de caractères
+    ma_var = "Arcreane"
+    ma_new_var = ""
+    for i in range(len(ma_var) - 1, -1, -1):
+        ma_new_var += ma_var[i]
+    ma_var = ma_new_var
+    print(ma_var)
+
+    # Comptage d'occurrences dans une liste
+    print(nb_occurence(53))
+
+    # Index des occurrences
+    index_occurrences = IndexOccurrences(ma_liste)
+    print(index_occurrences.compter_lot([53, 2, 27]))
+    print(index_occurrences.plus_frequentes(3))
+
+    # Demande de la taille du tapis
+    print("Please enter the size you want your carpet to be : ")
+    size = int(input())
+
+    # Test de la fonction
+    draw_carpet(size)
+
+    #-------------------------------------------
+    # Génération de listes
+    #-------------------------------------------
+
+    # Liste de 1 à 6
+    My_List = [i for i in range(1, 7)]
+    print(My_List)
+
+    # Liste des nombres impairs
+    My_List_impair = [x for x in My_List if x % 2 == 1]
+    print(My_List_impair)
+
+    #-------------------------------------------
+    # Création d'un mot à partir de deux variables
+    #-------------------------------------------
+
+    # !!! utilisez bien ma_var1 et ma_var2 pour vos opérations !!!!
+    # Créer un mot à partir des 2 premières lettres de ma_var1 et des 3 dernières lettres de ma_var2
+
+    ma_var1 = "Arcanine"
+    ma_var2 = "Arcanine"
 
-# !!! utilisez bien ma_var1 et ma_var2 pour vos opérations !!!!
-# Créer un mot à partir des 2 premières lettres de ma_var1 et des 3 dernières lettres de ma_var2
+    # Extraire les 2 premières lettres de ma_var1 et les 3 dernières lettres de ma_var2
+    combinaison = ma_var1[:2] + ma_var2[-3:]
 
-ma_var1 = "Arcanine"
-ma_var2 = "Arcanine"
+    print("Mot créé :", combinaison)
+    print(combinaison)
 
-# Extraire les 2 premières lettres de ma_var1 et les 3 dernières lettres de ma_var2
-combinaison = ma_var1[:2] + ma_var2[-3:]
 
-print("Mot créé :", combinaison)
-print(combinaison)
+# Tout exo2 est importable (IndexOccurrences, ligne_tapis, position_ligne, ecrire_tapis) :
+# la saisie, les démonstrations et le banc d'essai ne s'exécutent qu'en lançant le script
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,188 @@
 import random
+from collections import deque
+from time import perf_counter
+
+HIDDEN = " "  # Case non révélée
+FLAG = "\U0001F6A9"  # Drapeau rouge
+BOMB = "B"
+DIGITS = [str(n) for n in range(9)]  # Chiffre affiché selon le nombre de bombes adjacentes
+
+# Tables de conversion d'une grille aplatie en octets 0/1 (voir export_state)
+MINE_BYTES = str.maketrans({BOMB: "\1", **{str(n): "\0" for n in range(9)}})
+REVEALED_BYTES = str.maketrans({HIDDEN: "\0", FLAG: "\0", BOMB: "\1", **{str(n): "\1" for n in range(9)}})
+FLAG_BYTES = str.maketrans({HIDDEN: "\0", FLAG: "\1", BOMB: "\0", **{str(n): "\0" for n in range(9)}})
+
+
+class SaveError(Exception):
+    """
+    État de partie illisible : mauvaise signature, version inconnue ou données corrompues.
+    """
+
+
+def make_rng(seed):
+    """
+    Construit le générateur aléatoire d'une partie.
+    :param seed: Graine entière, instance de random.Random, ou None pour une graine tirée au hasard.
+    :return: Tuple (générateur, graine) ; la graine vaut None si un générateur a été fourni.
+    """
+    if isinstance(seed, random.Random):
+        return seed, None
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    return random.Random(seed), seed
+
+
+def sample_bombs(rng, rows, columns, bombs, first_click_row, first_click_col, safe_zone=False):
+    """
+    Tire les positions des bombes sans remise parmi les indices à plat (ligne * colonnes + colonne).
+    Le temps de tirage est borné quelle que soit la densité de bombes.
+    :param rng: Générateur aléatoire (random.Random).
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes à placer.
+    :param first_click_row: Ligne du premier clic.
+    :param first_click_col: Colonne du premier clic.
+    :param safe_zone: Si True, garde libre tout le carré 3x3 autour du premier clic
+                      (seulement la case cliquée s'il ne reste pas assez de place).
+    :return: Liste des indices à plat des bombes.
+    """
+    excluded = [first_click_row * columns + first_click_col]
+    if safe_zone:
+        zone = [
+            i * columns + j
+            for i in range(max(first_click_row - 1, 0), min(first_click_row + 2, rows))
+            for j in range(max(first_click_col - 1, 0), min(first_click_col + 2, columns))
+        ]
+        if rows * columns - len(zone) >= bombs:
+            excluded = zone
+    excluded.sort()
+
+    indices = rng.sample(range(rows * columns - len(excluded)), bombs)
+    for k, index in enumerate(indices):
+        # Décale l'indice tiré au-delà de chaque case exclue qui le précède
+        for skipped in excluded:
+            if index >= skipped:
+                index += 1
+        indices[k] = index
+    return indices
+
 
 class Minesweeper:
-    def __init__(self, rows, columns, bombs):
+    def __init__(self, rows, columns, bombs, seed=None, safe_zone=False, debug=False, verbose=True,
+                 instrumentation=None):
         """
         Initialise une nouvelle instance de la classe Minesweeper.
         :param rows: Nombre de lignes de la grille.
         :param columns: Nombre de colonnes de la grille.
         :param bombs: Nombre de bombes sur le champ.
+        :param seed: Graine entière ou instance de random.Random pour une grille reproductible.
+        :param safe_zone: Si True, le carré 3x3 autour du premier clic ne contient aucune bombe.
+        :param debug: Si True, les compteurs sont vérifiés par un parcours complet à chaque requête.
+        :param verbose: Si False, la solution n'est pas affichée au premier clic (mode silencieux).
+        :param instrumentation: Instance de instrumentation.Instrumentation recevant les mesures, ou None.
         """
+        if not 0 <= bombs < rows * columns:
+            raise ValueError(f"Impossible de placer {bombs} bombes sur une grille de {rows}x{columns}")
         self.__rows = rows
         self.__columns = columns
         self.__bombs = bombs
         self.__matrix = [["0" for _ in range(columns)] for _ in range(rows)]
         self.__display_matrix = [[" " for _ in range(columns)] for _ in range(rows)]
-        self.__flags = 0
+        self.__flags = 0  # Drapeaux posés
+        self.__correct_flags = 0  # Drapeaux posés sur une bombe
+        self.__hidden_safe = rows * columns - bombs  # Cases sans bombe encore cachées
         self.__first_click = True
+        self.__rng, self.__seed = make_rng(seed)
+        self.__safe_zone = safe_zone
+        self.__debug = debug
+        self.__verbose = verbose
+        self.__instr = instrumentation
+
+    def set_instrumentation(self, instrumentation):
+        """
+        Active ou désactive la mesure des appels du moteur.
+        :param instrumentation: Instance de instrumentation.Instrumentation, ou None pour désactiver.
+        """
+        self.__instr = instrumentation
 
     def __place_bombs(self, first_click_row, first_click_col):
         """
         Place les bombes aléatoirement sur la grille tout en évitant
-        la case initiale cliquée par l'utilisateur.
+        la case initiale cliquée par l'utilisateur (et ses voisines en mode safe_zone).
         :param first_click_row: Ligne du premier clic.
         :param first_click_col: Colonne du premier clic.
         """
-        placed_bombs = 0
-        while placed_bombs < self.__bombs:
-            i = random.randint(0, self.__rows - 1)
-            j = random.randint(0, self.__columns - 1)
-            # Vérifie que la case n'est pas la case initiale du clic
-            if (i, j) != (first_click_row, first_click_col) and self.__matrix[i][j] != "B":
-                self.__matrix[i][j] = "B"
-                placed_bombs += 1
+        for index in sample_bombs(self.__rng, self.__rows, self.__columns, self.__bombs,
+                                  first_click_row, first_click_col, self.__safe_zone):
+            i, j = divmod(index, self.__columns)
+            self.__matrix[i][j] = BOMB
+
+        # Des drapeaux ont pu être posés avant le premier clic
+        self.__correct_flags = sum(
+            1
+            for i in range(self.__rows)
+            for j in range(self.__columns)
+            if self.__display_matrix[i][j] == FLAG and self.__matrix[i][j] == BOMB
+        )
 
     def __calculate_numbers(self):
         """
         Calcule le nombre de bombes adjacentes pour chaque case de la grille
-        et met à jour la grille en conséquence.
+        et met à jour la grille en conséquence. Chaque bombe incrémente ses voisines :
+        le coût dépend du nombre de bombes plutôt que de 9 tests par case.
         """
-        for i in range(self.__rows):
-            for j in range(self.__columns):
-                if self.__matrix[i][j] == "B":
-                    continue
-
-                count = 0
-                for x in range(-1, 2):
-                    for y in range(-1, 2):
-                        new_i = i + x
-                        new_j = j + y
-                        if 0 <= new_i < self.__rows and 0 <= new_j < self.__columns and self.__matrix[new_i][
-                            new_j] == "B":
-                            count += 1
-                self.__matrix[i][j] = str(count)
+        counts = [[0] * self.__columns for _ in range(self.__rows)]
+        for i, matrix_row in enumerate(self.__matrix):
+            for j, cell in enumerate(matrix_row):
+                if cell == BOMB:
+                    for x in range(max(i - 1, 0), min(i + 2, self.__rows)):
+                        counts_row = counts[x]
+                        for y in range(max(j - 1, 0), min(j + 2, self.__columns)):
+                            counts_row[y] += 1
+
+        for matrix_row, counts_row in zip(self.__matrix, counts):
+            matrix_row[:] = [BOMB if cell == BOMB else DIGITS[count] for cell, count in zip(matrix_row, counts_row)]
 
     def __reveal_cells(self, row, col):
         """
-        Révèle les cellules adjacentes de manière récursive si aucune bombe
-        n'est présente autour de la case initiale.
+        Révèle la case puis, en largeur, les cases adjacentes tant qu'aucune bombe
+        n'est présente autour. Chaque case n'est visitée qu'une seule fois.
         :param row: Ligne de la cellule à révéler.
         :param col: Colonne de la cellule à révéler.
+        :return: Liste des coordonnées (ligne, colonne) nouvellement révélées.
         """
-        if not (0 <= row < self.__rows and 0 <= col < self.__columns) or self.__display_matrix[row][col] != " ":
-            return
+        if self.__display_matrix[row][col] != HIDDEN:
+            return []
 
-        self.__display_matrix[row][col] = self.__matrix[row][col]
+        matrix = self.__matrix
+        display = self.__display_matrix
+        display[row][col] = matrix[row][col]
+        revealed = [(row, col)]
+        queue = deque(revealed)
+        while queue:
+            i, j = queue.popleft()
+            if matrix[i][j] != "0":
+                continue
+            for x in range(max(i - 1, 0), min(i + 2, self.__rows)):
+                for y in range(max(j - 1, 0), min(j + 2, self.__columns)):
+                    if display[x][y] == HIDDEN:
+                        display[x][y] = matrix[x][y]
+                        revealed.append((x, y))
+                        queue.append((x, y))
+        return revealed
 
-        if self.__matrix[row][col] == "0":
-            for x in range(-1, 2):
-                for y in range(-1, 2):
-                    if x != 0 or y != 0:
-                        self.__reveal_cells(row + x, col + y)
+    def __visited(self, revealed):
+        """
+        Nombre de cases examinées par __reveal_cells pour produire revealed (mesures uniquement) :
+        chaque case vide révélée examine ses voisines dans la grille, elle-même exclue.
+        Même définition que dans array_logic.ArrayMinesweeper.
+        :param revealed: Liste des coordonnées révélées.
+        """
+        visited = 0
+        for i, j in revealed:
+            if self.__matrix[i][j] == "0":
+                visited += (min(i + 2, self.__rows) - max(i - 1, 0)) * (min(j + 2, self.__columns) - max(j - 1, 0)) - 1
+        return visited
 
     def display_solution(self):
         """
@@ -78,28 +192,62 @@ class Minesweeper:
         for row in self.__matrix:
             print(" ".join(row))
 
+    def generate(self, first_click_row, first_click_col):
+        """
+        Génère la grille (bombes et chiffres) autour du premier clic, si ce n'est pas déjà fait.
+        :param first_click_row: Ligne du premier clic.
+        :param first_click_col: Colonne du premier clic.
+        """
+        if not self.__first_click:
+            return
+        self.__place_bombs(first_click_row, first_click_col)
+        if self.__instr is not None:
+            start = perf_counter()
+            self.__calculate_numbers()
+            self.__instr.record("calculate_numbers", perf_counter() - start, cells=self.__rows * self.__columns)
+        else:
+            self.__calculate_numbers()
+        self.__first_click = False
+        if self.__verbose:
+            self.display_solution()  # Affiche la solution
+
     def click_cell(self, row, col):
         """
         Gère le clic sur une cellule de la grille.
         :param row: Ligne de la cellule cliquée.
         :param col: Colonne de la cellule cliquée.
-        :return: "lost" si une bombe est cliquée, "continue" sinon, ou "flagged" si un drapeau est présent.
+        :return: Tuple (résultat, cases révélées) : le résultat vaut "lost" si une bombe est cliquée,
+                 "continue" sinon, ou "flagged" si un drapeau est présent ; les cases révélées sont
+                 la liste des coordonnées (ligne, colonne) nouvellement découvertes par ce clic.
         """
+        if self.__instr is not None:
+            start = perf_counter()
+            result, revealed = self.__click_cell(row, col)
+            self.__instr.record("click_cell", perf_counter() - start, result=result, revealed=len(revealed))
+            return result, revealed
+        return self.__click_cell(row, col)
 
-        if self.__display_matrix[row][col] == "F":
-            return "flagged"  # Ne pas révéler une case marquée par un drapeau
+    def __click_cell(self, row, col):
+        """
+        Corps de click_cell, hors mesures.
+        """
+        if self.__display_matrix[row][col] == FLAG:
+            return "flagged", []  # Ne pas révéler une case marquée par un drapeau
 
-        if self.__first_click:
-            self.__place_bombs(row, col)  # Place les bombes avant le premier clic
-            self.__calculate_numbers()
-            self.__first_click = False
-            self.display_solution()  # Affiche la solution
+        self.generate(row, col)  # Place les bombes avant le premier clic
 
-        if self.__matrix[row][col] == "B":
-            return "lost"
+        if self.__matrix[row][col] == BOMB:
+            return "lost", []
 
-        self.__reveal_cells(row, col)
-        return "continue"
+        if self.__instr is not None:
+            start = perf_counter()
+            revealed = self.__reveal_cells(row, col)
+            self.__instr.record("reveal_cells", perf_counter() - start, revealed=len(revealed),
+                                visited=self.__visited(revealed))
+        else:
+            revealed = self.__reveal_cells(row, col)
+        self.__hidden_safe -= len(revealed)
+        return "continue", revealed
 
     def toggle_flag(self, row, col):
         """
@@ -107,28 +255,166 @@ class Minesweeper:
         :param row: Ligne de la cellule.
         :param col: Colonne de la cellule.
         """
+        if self.__instr is not None:
+            start = perf_counter()
+            self.__toggle_flag(row, col)
+            self.__instr.record("toggle_flag", perf_counter() - start, flags=self.__flags)
+        else:
+            self.__toggle_flag(row, col)
 
-        if self.__display_matrix[row][col] == " ":
-            self.__display_matrix[row][col] = "\U0001F6A9"  # Drapeau rouge
-        elif self.__display_matrix[row][col] == "\U0001F6A9":
-            self.__display_matrix[row][col] = " "
+    def __toggle_flag(self, row, col):
+        """
+        Corps de toggle_flag, hors mesures.
+        """
+        if self.__display_matrix[row][col] == HIDDEN:
+            self.__display_matrix[row][col] = FLAG
+            delta = 1
+        elif self.__display_matrix[row][col] == FLAG:
+            self.__display_matrix[row][col] = HIDDEN
+            delta = -1
+        else:
+            return
+
+        self.__flags += delta
+        if self.__matrix[row][col] == BOMB:
+            self.__correct_flags += delta
 
     def is_won(self):
         """
         Vérifie si le joueur a gagné la partie.
-        Une partie est gagnée si toutes les cases sans bombes sont révélées
-        et toutes les cases contenant des bombes sont soit non révélées, soit marquées avec un drapeau.
+        Une partie est gagnée si toutes les cases sans bombes sont révélées ;
+        une bombe cliquée termine la partie sans jamais être révélée.
         :return: True si la partie est gagnée, False sinon.
         """
+        if self.__instr is not None:
+            start = perf_counter()
+            won = self.__is_won()
+            self.__instr.record("is_won", perf_counter() - start, hidden_safe=self.__hidden_safe)
+            return won
+        return self.__is_won()
+
+    def __is_won(self):
+        """
+        Corps de is_won, hors mesures.
+        """
+        if self.__debug:
+            self.__check_counters()
+        return not self.__first_click and self.__hidden_safe == 0
+
+    def remaining_mines(self):
+        """
+        Nombre de bombes restant à marquer, d'après les drapeaux posés.
+        :return: Nombre de bombes moins nombre de drapeaux (peut être négatif).
+        """
+        if self.__debug:
+            self.__check_counters()
+        return self.__bombs - self.__flags
+
+    def correct_flags(self):
+        """
+        Nombre de drapeaux posés sur une bombe.
+        :return: Nombre de drapeaux corrects.
+        """
+        if self.__debug:
+            self.__check_counters()
+        return self.__correct_flags
+
+    def __check_counters(self):
+        """
+        Recompte l'état par un parcours complet de la grille et le compare aux compteurs
+        maintenus incrémentalement (mode debug uniquement).
+        """
+        hidden_safe = flags = correct_flags = 0
         for i in range(self.__rows):
             for j in range(self.__columns):
-                # Si une case sans bombe n'est pas révélée, le joueur n'a pas gagné
-                if self.__matrix[i][j] != "B" and self.__display_matrix[i][j] == " ":
-                    return False
-                # Si une case contenant une bombe est révélée sans drapeau, le joueur n'a pas gagné
-                if self.__matrix[i][j] == "B" and self.__display_matrix[i][j] not in [" ", "\U0001F6A9"]:
-                    return False
-        return True
+                shown = self.__display_matrix[i][j]
+                bomb = not self.__first_click and self.__matrix[i][j] == BOMB
+                if shown == FLAG:
+                    flags += 1
+                    correct_flags += bomb
+                if not bomb and shown in (HIDDEN, FLAG):
+                    hidden_safe += 1
+        if self.__first_click:
+            hidden_safe -= self.__bombs  # Les bombes ne sont pas encore placées
+        expected = (self.__hidden_safe, self.__flags, self.__correct_flags)
+        if expected != (hidden_safe, flags, correct_flags):
+            raise RuntimeError(
+                f"Compteurs incohérents : (cachées sûres, drapeaux, drapeaux corrects) = {expected}, "
+                f"parcours complet = {(hidden_safe, flags, correct_flags)}"
+            )
+
+    def get_seed(self):
+        """
+        Retourne la graine de la partie.
+        :return: Graine entière, ou None si un générateur random.Random a été fourni.
+        """
+        return self.__seed
+
+    def export_state(self):
+        """
+        Exporte l'état complet de la partie, chaque grille étant aplatie ligne par ligne
+        en un octet 0/1 par case.
+        :return: Dictionnaire (rows, columns, bombs, seed, generated, mines, revealed, flags).
+        """
+        cells = "".join("".join(row) for row in self.__matrix)
+        shown = "".join("".join(row) for row in self.__display_matrix)
+        return {
+            "rows": self.__rows,
+            "columns": self.__columns,
+            "bombs": self.__bombs,
+            "seed": self.__seed,
+            "generated": not self.__first_click,
+            "mines": cells.translate(MINE_BYTES).encode("latin-1"),
+            "revealed": shown.translate(REVEALED_BYTES).encode("latin-1"),
+            "flags": shown.translate(FLAG_BYTES).encode("latin-1"),
+        }
+
+    @classmethod
+    def from_state(cls, state, **options):
+        """
+        Reconstruit une partie à partir d'un état produit par export_state.
+        :param state: Dictionnaire (rows, columns, bombs, seed, generated, mines, revealed, flags).
+        :param options: Options supplémentaires du constructeur (safe_zone, debug, verbose).
+        :return: Nouvelle instance de Minesweeper.
+        """
+        rows, columns = state["rows"], state["columns"]
+        if not 0 <= state["bombs"] < rows * columns:
+            raise SaveError(f"Impossible de placer {state['bombs']} bombes sur une grille de {rows}x{columns}")
+        if state["generated"] and state["mines"].count(1) != state["bombs"]:
+            raise SaveError(f"{state['mines'].count(1)} bombes dans la grille, {state['bombs']} annoncées")
+        game = cls(rows, columns, state["bombs"], seed=state["seed"], **options)
+        mines, revealed, flags = state["mines"], state["revealed"], state["flags"]
+        if state["generated"]:
+            game.__matrix = [
+                [BOMB if bomb else "0" for bomb in mines[i * columns:(i + 1) * columns]] for i in range(rows)
+            ]
+            game.__calculate_numbers()
+            game.__first_click = False
+
+        for i in range(rows):
+            start = i * columns
+            matrix_row = game.__matrix[i]
+            game.__display_matrix[i] = [
+                matrix_row[j] if shown else (FLAG if flagged else HIDDEN)
+                for j, (shown, flagged) in enumerate(zip(revealed[start:start + columns],
+                                                         flags[start:start + columns]))
+            ]
+
+        game.__hidden_safe = rows * columns - state["bombs"] - revealed.count(1)
+        game.__flags = flags.count(1)
+        if state["generated"]:
+            both = int.from_bytes(mines, "big") & int.from_bytes(flags, "big")
+            game.__correct_flags = bin(both).count("1")
+        return game
+
+    def get_cell(self, row, col):
+        """
+        Retourne la valeur affichée d'une seule case.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        :return: Valeur affichée (chiffre, drapeau ou case cachée).
+        """
+        return self.__display_matrix[row][col]
 
     def get_display_matrix(self):
         """
@@ -1,8 +1,22 @@
+import time
+STARTUP = time.perf_counter()  # Début du chargement du module, pour le profil de démarrage
+import sys
 import tkinter as tk
 from tkinter import messagebox
-import time
-import pygame
-from game_logic import Minesweeper
+import os
+import threading
+from audio import BackgroundMusic
+from game_logic import Minesweeper, SaveError
+from canvas_board import CanvasBoard
+from solver import Solver
+from board_pool import BoardPool, DIFFICULTIES
+from instrumentation import Instrumentation, Histogram
+# savegame et array_logic chargent numpy (plus de la moitié du temps d'import) : ils ne sont importés
+# qu'à la reprise, à la sauvegarde ou au lancement d'une très grande grille
+
+LARGE_BOARD_CELLS = 100_000  # Au-delà, le moteur numpy est utilisé s'il est disponible
+SAVE_PATH = "partie.msw"  # Fichier de sauvegarde de la partie en cours
+IMPORTED = time.perf_counter()  # Fin des imports
 
 class MinesweeperApp:
     def __init__(self, root):
@@ -14,9 +28,23 @@ class MinesweeperApp:
         self.root.title("Minesweeper")
         self.game = None
         self.buttons = []
+        self.board = None  # Plateau CanvasBoard si ce rendu est choisi
+        self.solver = None  # Solveur utilisé pour les indices
+        self.hinted = None  # (ligne, colonne, couleur d'origine) de la case mise en évidence par un indice
+        self.hint_job = None  # Indice calculé en arrière-plan : (solveur, fil d'exécution, résultat)
+        self.renderer = tk.StringVar(self.root, value="buttons")  # "buttons" ou "canvas"
         self.start_time = None  # Début du chronomètre
         self.is_game_over = False  # Indicateur de fin de jeu
+        self.stats = Histogram()  # Mesures du moteur affichées par le panneau de statistiques
+        self.instrumentation = Instrumentation(self.stats)
+        self.show_stats = False  # Panneau de statistiques affiché (et moteur instrumenté)
+        self.stats_job = None  # Prochaine mise à jour programmée du panneau
+        self.pool = BoardPool()  # Grilles sans hasard pré-générées en arrière-plan
+        self.music = BackgroundMusic("music.mp3")
         self.__create_home_menu()
+        # Travaux non essentiels lancés une fois la fenêtre affichée
+        self.root.after_idle(self.music.start)
+        self.root.after_idle(self.pool.refill_async)
 
 
     def __create_home_menu(self):
@@ -35,11 +63,10 @@ class MinesweeperApp:
 
         tk.Button(home_frame, text="Commencer le jeu", font=("Arial", 50),bg='#3498DB',fg='#4a4e69', command=self.__create_difficulty_menu).pack(pady=15)
 
-        tk.Button(home_frame, text="Quitter", font=("Arial", 30),bg='#E74C3C',fg='#4a4e69', command=self.root.quit).pack(pady=50)
+        if os.path.exists(SAVE_PATH):
+            tk.Button(home_frame, text="Reprendre la partie", font=("Arial", 30),bg='#3498DB',fg='#4a4e69', command=self.__resume_game).pack(pady=15)
 
-        pygame.mixer.init()
-        pygame.mixer.music.load("music.mp3")
-        pygame.mixer.music.play(-1)
+        tk.Button(home_frame, text="Quitter", font=("Arial", 30),bg='#E74C3C',fg='#4a4e69', command=self.root.quit).pack(pady=50)
 
     def __create_difficulty_menu(self):
         """
@@ -59,28 +86,133 @@ class MinesweeperApp:
                   command=lambda: self.__start_game(16, 16, 40)).pack(pady=20)
         tk.Button(difficulty_frame, text="Difficile (20x24, 99 bombes)", font=("Arial", 20),bg=('#FADBD8'),
                   command=lambda: self.__start_game(20, 24, 99)).pack(pady=20)
+        tk.Button(difficulty_frame, text="Géant (1000x1000, 150000 bombes)", font=("Arial", 20),bg=('#FADBD8'),
+                  command=lambda: self.__start_game(1000, 1000, 150000, renderer="canvas")).pack(pady=20)
+
+        renderer_frame = tk.Frame(difficulty_frame)
+        renderer_frame.pack(pady=10)
+        tk.Label(renderer_frame, text="Affichage :", font=("Arial", 16)).pack(side=tk.LEFT)
+        tk.Radiobutton(renderer_frame, text="Boutons", variable=self.renderer, value="buttons",
+                       font=("Arial", 16)).pack(side=tk.LEFT)
+        tk.Radiobutton(renderer_frame, text="Canevas (grandes grilles)", variable=self.renderer, value="canvas",
+                       font=("Arial", 16)).pack(side=tk.LEFT)
 
         tk.Button(difficulty_frame, text="Retour", font=("Arial", 20),bg=('#FADBD8'), command=self.__create_home_menu).pack(pady=10)
 
-    def __start_game(self, rows, columns, bombs):
+    def __resume_game(self):
+        """
+        Reprend la partie enregistrée dans SAVE_PATH, avec le moteur adapté à sa taille.
+        """
+        from savegame import SavedBoard  # Import différé : savegame charge numpy, inutile au démarrage
+
+        try:
+            with SavedBoard(SAVE_PATH) as saved:
+                if not saved.verify():
+                    raise SaveError("somme de contrôle invalide")
+                header = saved.header
+                engine = self.__engine_for(header.rows, header.columns)
+                game = saved.load(engine, verbose=header.rows * header.columns < LARGE_BOARD_CELLS)
+        except (OSError, SaveError) as error:
+            messagebox.showerror("Sauvegarde", f"Impossible de reprendre la partie : {error}")
+            return
+        renderer = "canvas" if header.rows * header.columns >= LARGE_BOARD_CELLS else None
+        self.__start_game(header.rows, header.columns, header.bombs, renderer, game, header.elapsed)
+
+    def __engine_for(self, rows, columns):
+        """
+        Choisit le moteur adapté à la taille de la grille.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :return: ArrayMinesweeper pour les très grandes grilles si numpy est disponible, Minesweeper sinon.
+        """
+        if rows * columns < LARGE_BOARD_CELLS:
+            return Minesweeper
+        import array_logic  # Import différé : charge numpy, s'il est installé
+
+        return Minesweeper if array_logic.np is None else array_logic.ArrayMinesweeper
+
+    def __save_game(self):
+        """
+        Enregistre la partie en cours dans SAVE_PATH.
+        """
+        from savegame import save_game  # Import différé : savegame charge numpy, inutile au démarrage
+
+        try:
+            save_game(self.game, SAVE_PATH, time.time() - self.start_time)
+        except (OSError, SaveError) as error:
+            messagebox.showerror("Sauvegarde", f"Impossible d'enregistrer la partie : {error}")
+            return
+        self.hint_label.config(text="Partie sauvegardée")
+
+    def __start_game(self, rows, columns, bombs, renderer=None, game=None, elapsed=0.0):
         """
         Initialise une nouvelle partie avec la difficulté choisie.
         :param rows: Nombre de lignes de la grille.
         :param columns: Nombre de colonnes de la grille.
         :param bombs: Nombre de bombes sur la grille.
+        :param renderer: "buttons" ou "canvas" ; par défaut, le choix fait dans le menu.
+        :param game: Partie déjà commencée (reprise d'une sauvegarde), ou None pour une nouvelle partie.
+        :param elapsed: Temps déjà écoulé dans la partie reprise, en secondes.
         """
         for widget in self.root.winfo_children():
             widget.destroy()
 
-        self.game = Minesweeper(rows, columns, bombs)
+        opening = None  # Case de départ d'une grille sans hasard, révélée d'office
+        difficulty = next((name for name, size in DIFFICULTIES.items() if size == (rows, columns, bombs)), None)
+        if game is None and difficulty is not None:
+            taken = self.pool.take(difficulty)
+            if taken is not None:
+                game, opening = taken
+            self.pool.refill_async()  # Remplace la grille prise sans bloquer l'interface
+
+        if game is not None:
+            self.game = game
+        else:
+            # Solution trop grande pour la console au-delà de LARGE_BOARD_CELLS, quel que soit le moteur
+            verbose = rows * columns < LARGE_BOARD_CELLS
+            self.game = self.__engine_for(rows, columns)(rows, columns, bombs, verbose=verbose)
         self.buttons = []
-        self.start_time = time.time()  # Démarre le chronomètre
+        self.board = None
+        self.solver = Solver(self.game, rows, columns, bombs)
+        self.game.set_instrumentation(self.instrumentation if self.show_stats else None)
+        self.hinted = None
+        self.start_time = time.time() - elapsed  # Démarre le chronomètre
         self.is_game_over = False  # Réinitialise l'indicateur
 
         # Label pour afficher le chronomètre
         self.timer_label = tk.Label(self.root, text="Temps: 0 secondes", font=("Arial", 20), bg="#AED6F1", fg="#34495E")
         self.timer_label.grid(row=0, column=0, columnspan=columns, pady=(0, 10))
 
+        # Label pour afficher la latence de rafraîchissement du dernier clic
+        self.latency_label = tk.Label(self.root, text="Rendu: -", font=("Arial", 12), bg="#AED6F1", fg="#34495E")
+        self.latency_label.grid(row=rows + 1, column=0, columnspan=columns, pady=(10, 0))
+
+        # Bouton d'indice : propose une case sûre, ou la moins risquée
+        hint_frame = tk.Frame(self.root, bg="#AED6F1")
+        hint_frame.grid(row=rows + 2, column=0, columnspan=columns, pady=(5, 0))
+        tk.Button(hint_frame, text="Indice", font=("Arial", 14), bg='#FADBD8', command=self.__show_hint).pack(side=tk.LEFT)
+        tk.Button(hint_frame, text="Sauvegarder", font=("Arial", 14), bg='#FADBD8', command=self.__save_game).pack(side=tk.LEFT, padx=(5, 0))
+        tk.Button(hint_frame, text="Stats", font=("Arial", 14), bg='#FADBD8', command=self.__toggle_stats).pack(side=tk.LEFT, padx=(5, 0))
+        self.hint_label = tk.Label(hint_frame, text="", font=("Arial", 12), bg="#AED6F1", fg="#34495E")
+        self.hint_label.pack(side=tk.LEFT, padx=10)
+
+        # Panneau des mesures du moteur, affiché à la demande
+        self.stats_label = tk.Label(self.root, text="", font=("Courier", 10), justify=tk.LEFT, bg="#AED6F1", fg="#34495E")
+        self.stats_label.grid(row=rows + 3, column=0, columnspan=columns, pady=(5, 0))
+        if self.show_stats:
+            self.__refresh_stats()
+        else:
+            self.stats_label.grid_remove()
+
+        if (renderer or self.renderer.get()) == "canvas":
+            # Une seule zone de dessin, les clics sont convertis en cases par calcul
+            self.board = CanvasBoard(self.root, self.game, rows, columns, self.__on_click, self.__on_right_click)
+            self.board.grid(row=1, column=0, columnspan=columns)
+            self.__update_timer()
+            if opening is not None:
+                self.__on_click(None, *opening)
+            return
+
         # Configure la grille de boutons
         for i in range(rows):
             row_buttons = []
@@ -95,6 +227,12 @@ class MinesweeperApp:
                 row_buttons.append(btn)
             self.buttons.append(row_buttons)
 
+        if opening is not None:
+            self.__on_click(None, *opening)
+        elif game is not None:
+            # Partie reprise : affiche l'état restauré de toutes les cases
+            self.__update_buttons([(i, j) for i in range(rows) for j in range(columns)], time.perf_counter())
+
         # Lancer la mise à jour du chronomètre
         self.__update_timer()
 
@@ -120,20 +258,24 @@ class MinesweeperApp:
         :param row: Ligne de la cellule cliquée.
         :param col: Colonne de la cellule cliquée.
         """
-        result = self.game.click_cell(row, col)
-        self.__update_buttons()
+        if self.hint_job is not None:
+            return  # Le solveur lit la partie pour un indice en cours de calcul
+        start = time.perf_counter()
+        result, revealed = self.game.click_cell(row, col)
+        self.__update_buttons(revealed, start)
+        self.solver.update(revealed)
 
         if result == "lost":
             self.is_game_over = True  # Arrête le chronomètre
             elapsed_time = int(time.time() - self.start_time)
             messagebox.showinfo("Game Over", f"Vous avez perdu en {elapsed_time} secondes!")
-            pygame.mixer.quit()
+            self.music.stop()
             self.root.destroy()
         elif self.game.is_won():
             self.is_game_over = True  # Arrête le chronomètre
             elapsed_time = int(time.time() - self.start_time)
             messagebox.showinfo("Félicitations", f"Vous avez gagné en {elapsed_time} secondes!")
-            pygame.mixer.quit()
+            self.music.stop()
             self.root.destroy()
 
     def __on_right_click(self, event, row, col):
@@ -143,19 +285,153 @@ class MinesweeperApp:
         :param row: Ligne de la cellule.
         :param col: Colonne de la cellule.
         """
+        if self.hint_job is not None:
+            return  # Le solveur lit la partie pour un indice en cours de calcul
+        start = time.perf_counter()
         self.game.toggle_flag(row, col)
-        self.__update_buttons()
+        self.__update_buttons([(row, col)], start)
+
+    def __update_buttons(self, cells, start):
+        """
+        Met à jour uniquement les boutons des cases modifiées par le dernier clic,
+        puis affiche la latence du clic.
+        :param cells: Liste des coordonnées (ligne, colonne) modifiées.
+        :param start: Instant (time.perf_counter) de réception du clic.
+        """
+        if self.board is not None:
+            self.board.update_cells(cells)
+        else:
+            for i, j in cells:
+                self.buttons[i][j].config(text=self.game.get_cell(i, j))
+
+        self.__clear_hint()
+        latency = (time.perf_counter() - start) * 1000
+        self.latency_label.config(text=f"Rendu: {latency:.2f} ms ({len(cells)} cases)")
+
+    def __toggle_stats(self):
+        """
+        Affiche ou masque le panneau de statistiques ; le moteur n'est instrumenté que pendant l'affichage.
+        """
+        self.show_stats = not self.show_stats
+        if self.show_stats:
+            self.stats.reset()
+            self.game.set_instrumentation(self.instrumentation)
+            self.stats_label.grid()
+            self.__refresh_stats()
+        else:
+            self.game.set_instrumentation(None)
+            self.stats_label.grid_remove()
+            if self.stats_job is not None:
+                self.root.after_cancel(self.stats_job)
+                self.stats_job = None
+
+    def __refresh_stats(self):
+        """
+        Met à jour le panneau de statistiques deux fois par seconde tant qu'il est affiché.
+        """
+        if not self.show_stats or self.is_game_over:
+            return
+        self.stats_label.config(text=self.stats.format() or "Aucune mesure pour l'instant")
+        self.stats_job = self.root.after(500, self.__refresh_stats)
+
+    def __show_hint(self):
+        """
+        Demande au solveur le meilleur coup et met la case correspondante en évidence.
+        Sur une grande grille, le calcul se fait dans un fil d'exécution pour ne pas figer la fenêtre ;
+        les clics sont ignorés jusqu'au résultat, car le solveur lit la partie pendant ce temps.
+        """
+        if self.hint_job is not None:
+            return
+        self.__clear_hint()
+        if self.solver.rows * self.solver.columns < LARGE_BOARD_CELLS:
+            self.__display_hint(*self.solver.hint())
+            return
+        solver, result = self.solver, []
+        thread = threading.Thread(target=lambda: result.append(solver.hint()), daemon=True)
+        self.hint_job = (solver, thread, result)
+        self.hint_label.config(text="Calcul de l'indice...")
+        thread.start()
+        self.root.after(50, self.__poll_hint)
+
+    def __poll_hint(self):
+        """
+        Affiche l'indice calculé en arrière-plan dès qu'il est prêt.
+        """
+        solver, thread, result = self.hint_job
+        if thread.is_alive():
+            self.root.after(50, self.__poll_hint)
+            return
+        self.hint_job = None
+        self.hint_label.config(text="")
+        if solver is self.solver and result:
+            self.__display_hint(*result[0])
+
+    def __display_hint(self, cell, probability):
+        """
+        Met en évidence la case proposée : en vert si elle est sûre, en orange sinon, avec sa probabilité de bombe.
+        :param cell: Coordonnées (ligne, colonne) de la case.
+        :param probability: Probabilité de bombe de la case.
+        """
+        row, col = cell
+        color = "#82E0AA" if probability == 0 else "#F8C471"
+        if self.board is not None:
+            self.board.highlight(row, col, color)
+            self.hinted = (row, col, None)
+        else:
+            self.hinted = (row, col, self.buttons[row][col].cget("bg"))
+            self.buttons[row][col].config(bg=color)
+        if probability == 0:
+            self.hint_label.config(text=f"Case sûre : ligne {row + 1}, colonne {col + 1}")
+        else:
+            self.hint_label.config(text=f"Aucune case sûre, risque minimal {probability:.0%} : "
+                                        f"ligne {row + 1}, colonne {col + 1}")
 
-    def __update_buttons(self):
+    def __clear_hint(self):
         """
-        Met à jour l'affichage des boutons en fonction de la matrice du jeu.
+        Retire la mise en évidence du dernier indice.
         """
-        display_matrix = self.game.get_display_matrix()
-        for i, row in enumerate(display_matrix):
-            for j, value in enumerate(row):
-                self.buttons[i][j].config(text=value)
+        if self.hinted is None:
+            return
+        row, col, previous_bg = self.hinted
+        if self.board is not None:
+            self.board.highlight(None, None, None)
+        else:
+            self.buttons[row][col].config(bg=previous_bg)
+        self.hinted = None
+        self.hint_label.config(text="")
+
+def profile_startup(root, app, created):
+    """
+    Affiche la répartition du temps de démarrage une fois la première image dessinée,
+    puis l'instant où la musique est prête.
+    :param root: Fenêtre principale Tkinter.
+    :param app: Application MinesweeperApp.
+    :param created: Instant (time.perf_counter) où l'application a été construite.
+    """
+    def first_paint():
+        root.update_idletasks()
+        painted = time.perf_counter()
+        # numpy ne doit pas être chargé avant le premier affichage (voir les imports différés)
+        print(f"Imports {1000 * (IMPORTED - STARTUP):7.1f} ms{' (numpy chargé)' if 'numpy' in sys.modules else ''}")
+        print(f"Fenêtre {1000 * (created - IMPORTED):7.1f} ms")
+        print(f"Dessin  {1000 * (painted - created):7.1f} ms")
+        print(f"Total   {1000 * (painted - STARTUP):7.1f} ms jusqu'au premier affichage")
+        root.after(100, music_ready)
+
+    def music_ready():
+        if app.music.ready_at is not None:
+            print(f"Musique {1000 * (app.music.ready_at - STARTUP):7.1f} ms (en arrière-plan)")
+        elif app.music.error is None:
+            root.after(100, music_ready)
+
+    root.after_idle(first_paint)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = MinesweeperApp(root)
-    root.mainloop()
\ No newline at end of file
+    if "--profile-startup" in sys.argv:
+        profile_startup(root, app, time.perf_counter())
+    root.mainloop()
+    app.pool.stop()
+    app.music.stop()
\ No newline at end of file
@@ -0,0 +1,176 @@
+import json
+import time
+
+BUCKETS = 40  # Seaux de l'histogramme : le seau k couvre les durées de [2^(k-1), 2^k[ microsecondes
+# Valeurs instantanées transmises par les moteurs (état après l'appel) : Histogram garde la dernière
+# au lieu de les additionner comme les compteurs par appel (revealed, visited, cells)
+GAUGES = frozenset({"hidden_safe", "flags"})
+
+
+class Instrumentation:
+    def __init__(self, *sinks):
+        """
+        Point de collecte des mesures des moteurs de démineur : chaque appel instrumenté
+        (click_cell, reveal_cells, calculate_numbers, toggle_flag, is_won) est transmis à tous les puits.
+        S'active avec Minesweeper(..., instrumentation=...) ou game.set_instrumentation(...).
+        :param sinks: Puits de mesures (Histogram, JsonLinesSink, CallbackSink ou tout objet
+                      possédant une méthode record(name, duration, counters)).
+        """
+        self.sinks = list(sinks)
+
+    def add_sink(self, sink):
+        """
+        Ajoute un puits de mesures.
+        :param sink: Puits à ajouter.
+        """
+        self.sinks.append(sink)
+
+    def record(self, name, duration, **counters):
+        """
+        Transmet une mesure à tous les puits.
+        :param name: Nom de l'opération mesurée.
+        :param duration: Durée de l'appel, en secondes.
+        :param counters: Compteurs propres à l'opération (ex. revealed, visited).
+        """
+        for sink in self.sinks:
+            sink.record(name, duration, counters)
+
+
+class Histogram:
+    def __init__(self, gauges=GAUGES):
+        """
+        Puits en mémoire : pour chaque opération, nombre d'appels, durées totale et maximale,
+        histogramme logarithmique des durées, somme des compteurs numériques et dernière valeur
+        des valeurs instantanées. La mémoire utilisée ne dépend pas du nombre d'appels.
+        :param gauges: Noms des valeurs instantanées, dont seule la dernière est gardée.
+        """
+        self.gauges = frozenset(gauges)
+        self.__stats = {}
+
+    def record(self, name, duration, counters):
+        """
+        Ajoute une mesure.
+        :param name: Nom de l'opération mesurée.
+        :param duration: Durée de l'appel, en secondes.
+        :param counters: Compteurs propres à l'opération.
+        """
+        stats = self.__stats.get(name)
+        if stats is None:
+            stats = self.__stats[name] = {"count": 0, "total": 0.0, "max": 0.0, "buckets": [0] * BUCKETS,
+                                          "counters": {}}
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+        stats["buckets"][min(int(duration * 1e6).bit_length(), BUCKETS - 1)] += 1
+        totals = stats["counters"]
+        for key, value in counters.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = value if key in self.gauges else totals.get(key, 0) + value
+
+    def percentile(self, name, fraction):
+        """
+        Estime un centile des durées d'une opération, à un facteur 2 près.
+        :param name: Nom de l'opération.
+        :param fraction: Centile voulu, entre 0 et 1 (0.99 pour le 99e centile).
+        :return: Borne supérieure du seau contenant le centile, en secondes (0.0 sans mesure).
+        """
+        stats = self.__stats.get(name)
+        if stats is None:
+            return 0.0
+        target = fraction * stats["count"]
+        seen = 0
+        for bucket, count in enumerate(stats["buckets"]):
+            seen += count
+            if count and seen >= target:
+                return min((1 << bucket) * 1e-6, stats["max"])
+        return stats["max"]
+
+    def summary(self):
+        """
+        Résume les mesures de chaque opération.
+        :return: Dictionnaire nom -> (count, mean, p50, p99, max en secondes, counters) ; counters
+                 contient la somme des compteurs et la dernière valeur des valeurs instantanées.
+        """
+        return {
+            name: {
+                "count": stats["count"],
+                "mean": stats["total"] / stats["count"],
+                "p50": self.percentile(name, 0.5),
+                "p99": self.percentile(name, 0.99),
+                "max": stats["max"],
+                "counters": dict(stats["counters"]),
+            }
+            for name, stats in self.__stats.items()
+        }
+
+    def format(self):
+        """
+        Met en forme le résumé, une ligne par opération.
+        :return: Texte du résumé.
+        """
+        lines = []
+        for name, stats in sorted(self.summary().items()):
+            counters = " ".join(f"{key}={value}" for key, value in sorted(stats["counters"].items()))
+            lines.append(f"{name:<18} {stats['count']:>7} appels  moy {stats['mean'] * 1e6:9.1f} µs  "
+                         f"p99 ≤ {stats['p99'] * 1e6:9.1f} µs  max {stats['max'] * 1e6:9.1f} µs  {counters}")
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Oublie toutes les mesures.
+        """
+        self.__stats.clear()
+
+
+class JsonLinesSink:
+    def __init__(self, file):
+        """
+        Puits écrivant une ligne JSON par mesure.
+        :param file: Chemin du fichier (ouvert en ajout) ou objet fichier texte déjà ouvert.
+        """
+        self.__owned = isinstance(file, str)
+        self.__file = open(file, "a", encoding="utf-8", buffering=1 << 16) if self.__owned else file
+
+    def record(self, name, duration, counters):
+        """
+        Écrit une mesure.
+        :param name: Nom de l'opération mesurée.
+        :param duration: Durée de l'appel, en secondes.
+        :param counters: Compteurs propres à l'opération.
+        """
+        event = {"event": name, "time": time.time(), "duration_us": round(duration * 1e6, 3)}
+        event.update(counters)
+        self.__file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        """
+        Vide le tampon et ferme le fichier s'il a été ouvert par ce puits.
+        """
+        if self.__owned:
+            self.__file.close()
+        else:
+            self.__file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CallbackSink:
+    def __init__(self, callback):
+        """
+        Puits transmettant chaque mesure à une fonction.
+        :param callback: Fonction appelée avec (nom, durée en secondes, dictionnaire des compteurs).
+        """
+        self.callback = callback
+
+    def record(self, name, duration, counters):
+        """
+        Transmet une mesure à la fonction.
+        :param name: Nom de l'opération mesurée.
+        :param duration: Durée de l'appel, en secondes.
+        :param counters: Compteurs propres à l'opération.
+        """
+        self.callback(name, duration, counters)
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from server import GameServer, LINE_LIMIT
+from simulation import summarize, parse_size
+
+
+async def player(host, port, games, rows, columns, bombs, rng, results):
+    """
+    Client de charge : joue des parties complètes en cliquant au hasard sur les cases encore cachées,
+    une requête à la fois, et mesure la latence de chaque coup.
+    :param host: Adresse du serveur.
+    :param port: Port du serveur.
+    :param games: Nombre de parties à jouer.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param rng: Générateur aléatoire (random.Random) propre au client.
+    :param results: Dictionnaire des résultats, complété par le client.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+
+    async def call(request):
+        writer.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        if not response["ok"]:
+            raise RuntimeError(f"Erreur du serveur : {response['error']}")
+        return response
+
+    try:
+        for _ in range(games):
+            response = await call({"cmd": "new", "rows": rows, "columns": columns, "bombs": bombs,
+                                   "seed": rng.randrange(2 ** 32), "safe_zone": True})
+            session = response["session"]
+            hidden = [(i, j) for i in range(rows) for j in range(columns)]
+            rng.shuffle(hidden)
+            shown = set()
+            while True:
+                row, col = hidden.pop()
+                if (row, col) in shown:
+                    continue
+                start = time.perf_counter()
+                response = await call({"cmd": "click", "session": session, "row": row, "col": col})
+                results["moves"].append(time.perf_counter() - start)
+                shown.update((i, j) for i, j, _ in response["cells"])
+                if response["result"] == "lost" or response["won"]:
+                    results["wins"] += response["won"]
+                    break
+            await call({"cmd": "close", "session": session})
+            results["games"] += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, games, rows, columns, bombs, seed=0):
+    """
+    Lance des clients simultanés contre un serveur.
+    :param host: Adresse du serveur.
+    :param port: Port du serveur.
+    :param clients: Nombre de connexions simultanées.
+    :param games: Nombre de parties par client.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param seed: Graine des clients (le client k utilise seed + k).
+    :return: Dictionnaire des résultats (parties, victoires, latences des coups, durée totale).
+    """
+    results = {"games": 0, "wins": 0, "moves": []}
+    start = time.perf_counter()
+    await asyncio.gather(*(player(host, port, games, rows, columns, bombs, random.Random(seed + k), results)
+                           for k in range(clients)))
+    results["elapsed"] = time.perf_counter() - start
+    return results
+
+
+def format_report(label, results):
+    """
+    Met en forme les résultats d'un essai de charge.
+    :param label: Description de l'essai.
+    :param results: Dictionnaire renvoyé par run_load.
+    :return: Texte du rapport.
+    """
+    elapsed = results["elapsed"] or 1e-9
+    mean, p50, p99 = summarize(results["moves"])
+    return "\n".join([
+        f"{label} : {results['games']} parties, {len(results['moves'])} coups en {elapsed:.2f} s",
+        f"    {len(results['moves']) / elapsed:12.1f} coups/s {results['games'] / elapsed:12.1f} parties/s",
+        f"    Coup        moy {mean:10.1f} µs   p50 {p50:10.1f} µs   p99 {p99:10.1f} µs",
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Générateur de charge pour le serveur de démineur.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--local", action="store_true",
+                        help="Démarre un serveur dans ce processus, sur un port libre, au lieu de se connecter")
+    parser.add_argument("--clients", type=int, default=100, help="Connexions simultanées")
+    parser.add_argument("--games", type=int, default=10, help="Parties par client")
+    parser.add_argument("--size", type=parse_size, default=(16, 30, 99), help="Grille LIGNESxCOLONNESxBOMBES")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    async def load():
+        host, port = args.host, args.port
+        if args.local:
+            game_server = GameServer(max_sessions=max(args.clients, 10_000))
+            server = await game_server.start(host, 0)
+            port = server.sockets[0].getsockname()[1]
+        try:
+            return await run_load(host, port, args.clients, args.games, *args.size, args.seed)
+        finally:
+            if args.local:
+                game_server.stop()
+                server.close()
+                await server.wait_closed()
+
+    results = asyncio.run(load())
+    rows, columns, bombs = args.size
+    where = "serveur local" if args.local else f"{args.host}:{args.port}"
+    print(format_report(f"{rows}x{columns}x{bombs}, {args.clients} clients, {where}", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import argparse
+import bisect
+import struct
+import sys
+import time
+from array import array
+
+from game_logic import Minesweeper, make_rng
+from savegame import pack_bits, unpack_bits, encode_seed, decode_seed, SaveError
+
+CLICK = 0  # Coup : clic gauche (click_cell)
+TOGGLE = 1  # Coup : pose ou retrait d'un drapeau (toggle_flag)
+
+LOG_MAGIC = b"MSWL"
+LOG_VERSION = 2  # Version 2 : graine signée et options, encodées comme dans les sauvegardes
+# Signature, version, lignes, colonnes, bombes, graine, options, nombre de coups
+LOG_HEADER = struct.Struct("<4sHIIIqBQ")
+SAFE_ZONE = 1  # Option : partie jouée avec safe_zone (bit distinct de savegame.HAS_SEED)
+
+
+class MoveLog:
+    def __init__(self, rows, columns, bombs, seed, safe_zone=False):
+        """
+        Journal des coups d'une partie : avec la graine et les options de la grille, il suffit à
+        rejouer la partie à l'identique. Chaque coup tient dans un entier de 32 bits
+        (indice à plat * 2 + type de coup).
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur la grille.
+        :param seed: Graine entière de la grille.
+        :param safe_zone: Option safe_zone de la partie.
+        """
+        if seed is None:
+            raise ValueError("Une partie ne peut être rejouée que si sa graine est connue")
+        if rows * columns >= 2 ** 31:
+            raise ValueError(f"Grille trop grande pour le journal : {rows}x{columns}")
+        self.rows = rows
+        self.columns = columns
+        self.bombs = bombs
+        self.seed = seed
+        self.safe_zone = safe_zone
+        self.moves = array("I")
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __getitem__(self, index):
+        """
+        Décode un coup.
+        :param index: Numéro du coup (0 pour le premier).
+        :return: Tuple (type de coup, ligne, colonne).
+        """
+        code = self.moves[index]
+        row, col = divmod(code >> 1, self.columns)
+        return code & 1, row, col
+
+    def append(self, kind, row, col):
+        """
+        Ajoute un coup à la fin du journal.
+        :param kind: CLICK ou TOGGLE.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        self.moves.append((row * self.columns + col) << 1 | kind)
+
+    def truncate(self, count):
+        """
+        Ne garde que les count premiers coups.
+        :param count: Nombre de coups conservés.
+        """
+        del self.moves[count:]
+
+    def new_game(self, engine=Minesweeper):
+        """
+        Crée la partie vierge correspondant au journal.
+        :param engine: Classe de moteur (Minesweeper ou ArrayMinesweeper).
+        """
+        return engine(self.rows, self.columns, self.bombs, seed=self.seed, safe_zone=self.safe_zone,
+                      verbose=False)
+
+    def save(self, path):
+        """
+        Écrit le journal : en-tête puis coups en entiers 32 bits petit-boutistes.
+        :param path: Chemin du fichier.
+        """
+        moves = array("I", self.moves)
+        if sys.byteorder == "big":
+            moves.byteswap()
+        has_seed, seed = encode_seed(self.seed)
+        options = has_seed | (SAFE_ZONE if self.safe_zone else 0)
+        with open(path, "wb") as file:
+            file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.rows, self.columns, self.bombs, seed, options,
+                                       len(moves)))
+            file.write(moves.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Lit un journal écrit par save.
+        :param path: Chemin du fichier.
+        :return: Nouvelle instance de MoveLog.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < LOG_HEADER.size:
+            raise SaveError(f"{path} : en-tête tronqué")
+        magic, version, rows, columns, bombs, seed, options, count = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise SaveError(f"{path} : pas un journal de démineur (version {LOG_VERSION})")
+        seed = decode_seed(options, seed)
+        if seed is None:
+            raise SaveError(f"{path} : graine absente, la partie ne peut pas être rejouée")
+        log = cls(rows, columns, bombs, seed, bool(options & SAFE_ZONE))
+        log.moves.frombytes(data[LOG_HEADER.size:])
+        if len(log.moves) != count:
+            raise SaveError(f"{path} : {len(log.moves)} coups lus, {count} annoncés")
+        if sys.byteorder == "big":
+            log.moves.byteswap()
+        return log
+
+
+def apply_move(game, log, index):
+    """
+    Rejoue un coup du journal sur une partie.
+    :param game: Partie dans l'état qui précède le coup.
+    :param log: Journal des coups.
+    :param index: Numéro du coup.
+    :return: Résultat de click_cell pour un clic, None pour un drapeau.
+    """
+    kind, row, col = log[index]
+    if kind == CLICK:
+        return game.click_cell(row, col)
+    game.toggle_flag(row, col)
+    return None
+
+
+class Replayer:
+    def __init__(self, log, engine=Minesweeper, snapshot_every=1000):
+        """
+        Reconstruit l'état d'une partie après n'importe quel coup de son journal.
+        Un instantané (cartes de bits compactées) est gardé tous les snapshot_every coups :
+        atteindre le coup N ne rejoue que les coups qui suivent l'instantané précédent.
+        :param log: Journal des coups (MoveLog).
+        :param engine: Classe de moteur (Minesweeper ou ArrayMinesweeper).
+        :param snapshot_every: Nombre de coups entre deux instantanés.
+        """
+        self.log = log
+        self.engine = engine
+        self.snapshot_every = snapshot_every
+        self.__positions = [0]  # Numéros de coup des instantanés, triés
+        self.__snapshots = {0: None}  # Numéro de coup -> état compacté (None : partie vierge)
+
+    def snapshot(self, position, game):
+        """
+        Garde l'état d'une partie arrivée au coup position.
+        :param position: Nombre de coups déjà joués.
+        :param game: Partie dans cet état.
+        """
+        state = game.export_state()
+        if position not in self.__snapshots:
+            bisect.insort(self.__positions, position)
+        self.__snapshots[position] = (state["generated"], pack_bits(state["mines"]), pack_bits(state["revealed"]),
+                                      pack_bits(state["flags"]))
+
+    def __restore(self, position):
+        """
+        Reconstruit la partie d'un instantané.
+        :param position: Numéro de coup d'un instantané existant.
+        """
+        snapshot = self.__snapshots[position]
+        if snapshot is None:
+            return self.log.new_game(self.engine)
+        count = self.log.rows * self.log.columns
+        generated, mines, revealed, flags = snapshot
+        state = {
+            "rows": self.log.rows, "columns": self.log.columns, "bombs": self.log.bombs, "seed": self.log.seed,
+            "generated": generated, "mines": unpack_bits(mines, count), "revealed": unpack_bits(revealed, count),
+            "flags": unpack_bits(flags, count),
+        }
+        return self.engine.from_state(state, safe_zone=self.log.safe_zone, verbose=False)
+
+    def seek(self, position):
+        """
+        Reconstruit la partie après les position premiers coups, en partant de l'instantané le plus proche
+        et en ajoutant les instantanés manquants en chemin.
+        :param position: Nombre de coups à jouer (entre 0 et len(log)).
+        :return: Nouvelle partie dans cet état.
+        """
+        if not 0 <= position <= len(self.log):
+            raise IndexError(f"Coup {position} hors du journal ({len(self.log)} coups)")
+        base = self.__positions[bisect.bisect_right(self.__positions, position) - 1]
+        game = self.__restore(base)
+        for index in range(base, position):
+            apply_move(game, self.log, index)
+            if (index + 1) % self.snapshot_every == 0 and index + 1 not in self.__snapshots:
+                self.snapshot(index + 1, game)
+        return game
+
+    def truncate(self, position):
+        """
+        Oublie les instantanés postérieurs au coup position (le journal a été raccourci).
+        :param position: Nouveau nombre de coups du journal.
+        """
+        while self.__positions[-1] > position:
+            del self.__snapshots[self.__positions.pop()]
+
+
+class RecordedGame:
+    def __init__(self, rows, columns, bombs, seed=None, safe_zone=False, engine=Minesweeper, snapshot_every=1000):
+        """
+        Partie dont chaque coup est enregistré dans un MoveLog, avec annulation.
+        Les autres méthodes (get_cell, is_won...) sont celles de la partie sous-jacente.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur la grille.
+        :param seed: Graine entière (tirée au hasard si None).
+        :param safe_zone: Si True, le carré 3x3 autour du premier clic ne contient aucune bombe.
+        :param engine: Classe de moteur (Minesweeper ou ArrayMinesweeper).
+        :param snapshot_every: Nombre de coups entre deux instantanés.
+        """
+        _, seed = make_rng(seed)
+        self.log = MoveLog(rows, columns, bombs, seed, safe_zone)
+        self.replayer = Replayer(self.log, engine, snapshot_every)
+        self.game = self.log.new_game(engine)
+
+    def __getattr__(self, name):
+        return getattr(self.game, name)
+
+    def __recorded(self):
+        """
+        Garde un instantané de la partie tous les snapshot_every coups.
+        """
+        position = len(self.log)
+        if position % self.replayer.snapshot_every == 0:
+            self.replayer.snapshot(position, self.game)
+
+    def click_cell(self, row, col):
+        """
+        Enregistre puis joue un clic, comme Minesweeper.click_cell.
+        """
+        self.log.append(CLICK, row, col)
+        result = self.game.click_cell(row, col)
+        self.__recorded()
+        return result
+
+    def toggle_flag(self, row, col):
+        """
+        Enregistre puis joue un drapeau, comme Minesweeper.toggle_flag.
+        """
+        self.log.append(TOGGLE, row, col)
+        self.game.toggle_flag(row, col)
+        self.__recorded()
+
+    def undo(self, count=1):
+        """
+        Annule les derniers coups en repartant de l'instantané qui les précède.
+        :param count: Nombre de coups à annuler.
+        :return: Nombre de coups restant dans le journal.
+        """
+        position = max(len(self.log) - count, 0)
+        self.log.truncate(position)
+        self.replayer.truncate(position)
+        self.game = self.replayer.seek(position)
+        return position
+
+
+def main(argv=None):
+    from simulation import ENGINES
+
+    parser = argparse.ArgumentParser(description="Rejoue un journal de coups de démineur.")
+    parser.add_argument("path", help="Journal écrit par MoveLog.save")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="list")
+    parser.add_argument("--move", type=int, default=None, help="Coup à atteindre (défaut : fin du journal)")
+    parser.add_argument("--snapshot-every", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    log = MoveLog.load(args.path)
+    engine = ENGINES[args.engine]
+    if engine is None:
+        parser.error(f"le moteur {args.engine!r} nécessite numpy (pip install numpy)")
+    position = len(log) if args.move is None else args.move
+    replayer = Replayer(log, engine, args.snapshot_every)
+
+    start = time.perf_counter()
+    game = replayer.seek(position)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    replayer.seek(position)
+    second = time.perf_counter() - start
+    print(f"{log.rows}x{log.columns}x{log.bombs}, graine {log.seed} : coup {position}/{len(log)}")
+    print(f"    rejeu complet {first * 1000:10.1f} ms   depuis un instantané {second * 1000:10.1f} ms")
+    print(f"    partie {'gagnée' if game.is_won() else 'en cours ou perdue'}, "
+          f"{game.remaining_mines()} bombes restant à marquer")
+
+
+if __name__ == "__main__":
+    main()
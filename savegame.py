@@ -0,0 +1,214 @@
+import mmap
+import struct
+import zlib
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy accélère seulement le (dé)compactage des bits
+    np = None
+
+from game_logic import Minesweeper, SaveError  # SaveError est défini avec les moteurs, qui le lèvent aussi
+
+MAGIC = b"MSWP"
+# Version 2 : la somme de contrôle couvre aussi l'en-tête ; version 3 : option HAS_SEED
+VERSION = 3
+# Signature, version, options, lignes, colonnes, bombes, graine (0 si aucune), temps écoulé, CRC32 de l'en-tête
+# (sans ce champ) et des données
+HEADER = struct.Struct("<4sHHIIIqdI")
+CHECKED = struct.calcsize("<4sHHIIIqd")  # Octets de l'en-tête couverts par la somme de contrôle
+GENERATED = 1  # Option : les bombes sont placées
+HAS_SEED = 2  # Option : la graine est connue (toute valeur du champ, négatifs compris, est une graine)
+SEED_RANGE = range(-2 ** 63, 2 ** 63)  # Graines représentables par le champ (entier signé de 64 bits)
+
+SaveHeader = namedtuple("SaveHeader", "rows columns bombs seed elapsed generated")
+
+# Conversion entre un octet 0/1 par case et les caractères "0"/"1" lus par int(..., 2)
+_TO_DIGITS = bytes.maketrans(b"\0\1", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\0\1")
+
+
+def pack_bits(cells):
+    """
+    Compacte un octet 0/1 par case en un bit par case (bit de poids fort en premier).
+    :param cells: Octets valant 0 ou 1.
+    :return: Octets compactés, complétés par des zéros jusqu'à un multiple de 8 cases.
+    """
+    if np is not None:
+        return np.packbits(np.frombuffer(cells, dtype=np.uint8)).tobytes()
+    size = (len(cells) + 7) // 8
+    if not size:
+        return b""
+    digits = bytes(cells).translate(_TO_DIGITS) + b"0" * (size * 8 - len(cells))
+    return int(digits, 2).to_bytes(size, "big")
+
+
+def unpack_bits(data, count):
+    """
+    Opération inverse de pack_bits.
+    :param data: Octets compactés.
+    :param count: Nombre de cases à extraire.
+    :return: Octets valant 0 ou 1, un par case.
+    """
+    if np is not None:
+        return np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count).tobytes()
+    if not count:
+        return b""
+    digits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")
+    return digits[:count].encode("ascii").translate(_FROM_DIGITS)
+
+
+def encode_seed(seed):
+    """
+    Prépare la graine d'une partie pour un en-tête binaire.
+    :param seed: Graine entière, ou None si elle est inconnue.
+    :return: Tuple (options HAS_SEED ou 0, valeur du champ de graine).
+    """
+    if seed is None:
+        return 0, 0
+    if not isinstance(seed, int) or seed not in SEED_RANGE:
+        raise SaveError(f"Graine {seed!r} non enregistrable : entier de -2**63 à 2**63 - 1 attendu")
+    return HAS_SEED, seed
+
+
+def decode_seed(options, value):
+    """
+    Relit une graine écrite avec encode_seed.
+    :param options: Options de l'en-tête.
+    :param value: Valeur du champ de graine.
+    :return: Graine entière, ou None si elle est inconnue.
+    """
+    return value if options & HAS_SEED else None
+
+
+def save_game(game, path, elapsed=0.0):
+    """
+    Enregistre une partie dans le format binaire compact : en-tête puis trois cartes de bits
+    (bombes, cases révélées, drapeaux).
+    :param game: Partie à enregistrer (Minesweeper ou ArrayMinesweeper).
+    :param path: Chemin du fichier.
+    :param elapsed: Temps de jeu écoulé, en secondes.
+    """
+    state = game.export_state()
+    body = pack_bits(state["mines"]) + pack_bits(state["revealed"]) + pack_bits(state["flags"])
+    has_seed, seed = encode_seed(state["seed"])
+    fields = (MAGIC, VERSION, has_seed | (GENERATED if state["generated"] else 0), state["rows"],
+              state["columns"], state["bombs"], seed, elapsed)
+    crc = zlib.crc32(body, zlib.crc32(HEADER.pack(*fields, 0)[:CHECKED]))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(*fields, crc))
+        file.write(body)
+
+
+class SavedBoard:
+    def __init__(self, path):
+        """
+        Accès direct à un fichier de sauvegarde projeté en mémoire (mmap) : une case se lit sans
+        charger le reste du plateau.
+        :param path: Chemin du fichier.
+        """
+        self.__map = None
+        self.__file = open(path, "rb")
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Fichier vide
+            self.__file.close()
+            raise SaveError(f"{path} : fichier vide")
+
+        if len(self.__map) < HEADER.size:
+            self.close()
+            raise SaveError(f"{path} : en-tête tronqué")
+        magic, version, options, rows, columns, bombs, seed, elapsed, crc = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SaveError(f"{path} : pas une sauvegarde de démineur (version {VERSION})")
+
+        self.header = SaveHeader(rows, columns, bombs, decode_seed(options, seed), elapsed,
+                                 bool(options & GENERATED))
+        self.__crc = crc
+        self.__bitmap_size = (rows * columns + 7) // 8
+        if len(self.__map) != HEADER.size + 3 * self.__bitmap_size:
+            self.close()
+            raise SaveError(f"{path} : taille de fichier incohérente")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Libère la projection mémoire et ferme le fichier.
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
+
+    def verify(self):
+        """
+        Vérifie la somme de contrôle de l'en-tête et des données.
+        :return: True si l'en-tête et les cartes de bits sont intacts.
+        """
+        return zlib.crc32(self.__map[HEADER.size:], zlib.crc32(self.__map[:CHECKED])) == self.__crc
+
+    def __bit(self, bitmap, row, col):
+        """
+        Lit le bit d'une case dans l'une des trois cartes de bits.
+        :param bitmap: 0 pour les bombes, 1 pour les cases révélées, 2 pour les drapeaux.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        index = row * self.header.columns + col
+        byte = self.__map[HEADER.size + bitmap * self.__bitmap_size + index // 8]
+        return bool(byte >> (7 - index % 8) & 1)
+
+    def is_mine(self, row, col):
+        """
+        Indique si une case contient une bombe.
+        """
+        return self.__bit(0, row, col)
+
+    def is_revealed(self, row, col):
+        """
+        Indique si une case est révélée.
+        """
+        return self.__bit(1, row, col)
+
+    def is_flagged(self, row, col):
+        """
+        Indique si une case porte un drapeau.
+        """
+        return self.__bit(2, row, col)
+
+    def load(self, engine=Minesweeper, **options):
+        """
+        Reconstruit la partie complète.
+        :param engine: Classe de moteur à instancier (Minesweeper ou ArrayMinesweeper).
+        :param options: Options supplémentaires du constructeur (safe_zone, debug, verbose).
+        :return: Partie restaurée.
+        """
+        count = self.header.rows * self.header.columns
+        start = HEADER.size
+        bitmaps = [self.__map[start + k * self.__bitmap_size:start + (k + 1) * self.__bitmap_size]
+                   for k in range(3)]
+        state = self.header._asdict()
+        del state["elapsed"]
+        state["mines"], state["revealed"], state["flags"] = (unpack_bits(bitmap, count) for bitmap in bitmaps)
+        return engine.from_state(state, **options)
+
+
+def load_game(path, engine=Minesweeper, verify=True, **options):
+    """
+    Charge une partie enregistrée par save_game.
+    :param path: Chemin du fichier.
+    :param engine: Classe de moteur à instancier (Minesweeper ou ArrayMinesweeper).
+    :param verify: Si True, la somme de contrôle est vérifiée avant le chargement.
+    :param options: Options supplémentaires du constructeur (safe_zone, debug, verbose).
+    :return: Tuple (partie, en-tête SaveHeader).
+    """
+    with SavedBoard(path) as saved:
+        if verify and not saved.verify():
+            raise SaveError(f"{path} : somme de contrôle invalide")
+        return saved.load(engine, **options), saved.header
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import secrets
+import time
+
+from game_logic import Minesweeper, HIDDEN
+
+LINE_LIMIT = 64 * 1024  # Taille maximale d'une requête, en octets
+
+
+class Session:
+    __slots__ = ("game", "rows", "columns", "bombs", "last_seen", "over")
+
+    def __init__(self, game, rows, columns, bombs):
+        """
+        Partie hébergée par le serveur.
+        :param game: Instance de Minesweeper.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur la grille.
+        """
+        self.game = game
+        self.rows = rows
+        self.columns = columns
+        self.bombs = bombs
+        self.last_seen = time.monotonic()
+        self.over = False  # Partie perdue ou gagnée : plus aucun coup accepté
+
+
+class RequestError(Exception):
+    """
+    Requête invalide : le message est renvoyé au client.
+    """
+
+
+class GameServer:
+    def __init__(self, max_sessions=10_000, max_cells=10_000, idle_timeout=300.0):
+        """
+        Serveur de parties de démineur parlant un protocole JSON, une requête et une réponse par ligne.
+        Commandes (champ "cmd") :
+            new   : rows, columns, bombs, seed et safe_zone facultatifs -> session, seed
+            click : session, row, col -> result, cells (cases modifiées), won
+            flag  : session, row, col -> cells, remaining
+            state : session -> cells (toutes les cases révélées ou marquées), won, over
+            close : session
+        Chaque case modifiée est envoyée sous la forme [ligne, colonne, valeur affichée].
+        Un champ "id" de la requête est recopié dans la réponse. En cas d'erreur, la réponse
+        vaut {"ok": false, "error": message}.
+        :param max_sessions: Nombre maximal de parties simultanées.
+        :param max_cells: Nombre maximal de cases d'une partie, ce qui borne la mémoire d'une session.
+        :param idle_timeout: Durée d'inactivité, en secondes, au-delà de laquelle une partie est supprimée.
+        """
+        self.max_sessions = max_sessions
+        self.max_cells = max_cells
+        self.idle_timeout = idle_timeout
+        self.sessions = {}  # Clé de session -> Session
+        self.__expiry = None  # Tâche de suppression des parties inactives
+        self.commands = {"new": self.__new, "click": self.__click, "flag": self.__flag, "state": self.__state,
+                         "close": self.__close}
+
+    def expire(self, now=None):
+        """
+        Supprime les parties inactives depuis plus de idle_timeout secondes.
+        :param now: Instant de référence (time.monotonic), par défaut l'instant présent.
+        :return: Nombre de parties supprimées.
+        """
+        limit = (time.monotonic() if now is None else now) - self.idle_timeout
+        expired = [key for key, session in self.sessions.items() if session.last_seen < limit]
+        for key in expired:
+            del self.sessions[key]
+        return len(expired)
+
+    async def expire_forever(self, period=None):
+        """
+        Appelle expire périodiquement.
+        :param period: Intervalle entre deux passages, en secondes (par défaut, un dixième de idle_timeout).
+        """
+        while True:
+            await asyncio.sleep(period or max(self.idle_timeout / 10, 0.1))
+            self.expire()
+
+    def dispatch(self, request):
+        """
+        Traite une requête décodée.
+        :param request: Dictionnaire de la requête.
+        :return: Dictionnaire de la réponse.
+        """
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("La requête doit être un objet JSON")
+            name = request.get("cmd")
+            command = self.commands.get(name) if isinstance(name, str) else None
+            if command is None:
+                raise RequestError(f"Commande inconnue : {request.get('cmd')!r}")
+            response = command(request)
+            response["ok"] = True
+        except RequestError as error:
+            response = {"ok": False, "error": str(error)}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def __session(self, request):
+        """
+        Retrouve la partie désignée par une requête et la marque comme active.
+        :param request: Dictionnaire de la requête.
+        """
+        key = request.get("session")
+        session = self.sessions.get(key) if isinstance(key, str) else None
+        if session is None:
+            raise RequestError("Session inconnue ou expirée")
+        session.last_seen = time.monotonic()
+        return session
+
+    @staticmethod
+    def __integer(request, key, low, high):
+        """
+        Lit un champ entier d'une requête et vérifie qu'il est dans [low, high[.
+        :param request: Dictionnaire de la requête.
+        :param key: Nom du champ.
+        """
+        value = request.get(key)
+        if not isinstance(value, int) or isinstance(value, bool) or not low <= value < high:
+            raise RequestError(f"Champ {key!r} invalide : {value!r}")
+        return value
+
+    def __cell(self, request, session):
+        """
+        Lit les coordonnées d'une case et vérifie que la partie accepte encore des coups.
+        :param request: Dictionnaire de la requête.
+        :param session: Partie visée.
+        """
+        if session.over:
+            raise RequestError("Partie terminée")
+        return (self.__integer(request, "row", 0, session.rows),
+                self.__integer(request, "col", 0, session.columns))
+
+    def __new(self, request):
+        """
+        Crée une partie.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            self.expire()
+            if len(self.sessions) >= self.max_sessions:
+                raise RequestError("Trop de parties en cours")
+        rows = self.__integer(request, "rows", 1, self.max_cells + 1)
+        columns = self.__integer(request, "columns", 1, self.max_cells // rows + 1)
+        bombs = self.__integer(request, "bombs", 0, rows * columns)
+        seed = request.get("seed")
+        if seed is not None:
+            seed = self.__integer(request, "seed", 0, 2 ** 63)
+        game = Minesweeper(rows, columns, bombs, seed=seed, safe_zone=bool(request.get("safe_zone")),
+                           verbose=False)
+        key = secrets.token_hex(8)
+        self.sessions[key] = Session(game, rows, columns, bombs)
+        return {"session": key, "seed": game.get_seed()}
+
+    def __click(self, request):
+        """
+        Joue un clic et renvoie les cases révélées.
+        """
+        session = self.__session(request)
+        row, col = self.__cell(request, session)
+        game = session.game
+        result, revealed = game.click_cell(row, col)
+        won = result == "continue" and game.is_won()
+        session.over = result == "lost" or won
+        return {"result": result, "won": won, "cells": [[i, j, game.get_cell(i, j)] for i, j in revealed]}
+
+    def __flag(self, request):
+        """
+        Pose ou retire un drapeau.
+        """
+        session = self.__session(request)
+        row, col = self.__cell(request, session)
+        game = session.game
+        game.toggle_flag(row, col)
+        return {"cells": [[row, col, game.get_cell(row, col)]], "remaining": game.remaining_mines()}
+
+    def __state(self, request):
+        """
+        Renvoie toutes les cases visibles, pour resynchroniser un client.
+        """
+        session = self.__session(request)
+        game = session.game
+        cells = [[i, j, value] for i, line in enumerate(game.get_display_matrix())
+                 for j, value in enumerate(line) if value != HIDDEN]
+        return {"rows": session.rows, "columns": session.columns, "bombs": session.bombs, "cells": cells,
+                "won": game.is_won(), "over": session.over}
+
+    def __close(self, request):
+        """
+        Supprime une partie.
+        """
+        self.__session(request)
+        del self.sessions[request["session"]]
+        return {}
+
+    async def handle(self, reader, writer):
+        """
+        Sert une connexion : lit les requêtes ligne par ligne et répond dans l'ordre.
+        Une connexion peut piloter plusieurs parties, et une partie survit à sa connexion.
+        :param reader: Flux de lecture asyncio.
+        :param writer: Flux d'écriture asyncio.
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Ligne plus longue que LINE_LIMIT
+                    writer.write(b'{"ok": false, "error": "Requete trop longue"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "JSON invalide"}
+                else:
+                    response = self.dispatch(request)
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Démarre l'écoute et la suppression périodique des parties inactives.
+        :param host: Adresse d'écoute.
+        :param port: Port d'écoute (0 pour un port libre choisi par le système).
+        :return: Serveur asyncio (asyncio.Server).
+        """
+        server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        self.__expiry = asyncio.get_running_loop().create_task(self.expire_forever())
+        return server
+
+    def stop(self):
+        """
+        Arrête la suppression périodique des parties inactives.
+        """
+        if self.__expiry is not None:
+            self.__expiry.cancel()
+            self.__expiry = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties de démineur (JSON, une requête par ligne).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    parser.add_argument("--max-cells", type=int, default=10_000, help="Nombre maximal de cases par partie")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="Inactivité maximale, en secondes")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        game_server = GameServer(args.max_sessions, args.max_cells, args.idle_timeout)
+        server = await game_server.start(args.host, args.port)
+        print(f"Serveur de démineur à l'écoute sur {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import Minesweeper, HIDDEN
+from solver import SolverStrategy
+
+try:
+    from array_logic import ArrayMinesweeper
+except ImportError:
+    ArrayMinesweeper = None
+
+ENGINES = {"list": Minesweeper, "array": ArrayMinesweeper}
+
+
+class RandomStrategy:
+    def __init__(self, rows, columns, bombs, rng):
+        """
+        Stratégie de référence : clique au hasard sur une case encore cachée.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur la grille.
+        :param rng: Générateur aléatoire (random.Random) propre à la partie.
+        """
+        self.__cells = [(i, j) for i in range(rows) for j in range(columns)]
+        rng.shuffle(self.__cells)
+
+    def next_move(self, game):
+        """
+        Choisit la prochaine case à cliquer.
+        :param game: Partie en cours.
+        :return: Coordonnées (ligne, colonne) de la case à cliquer.
+        """
+        while True:
+            row, col = self.__cells.pop()
+            if game.get_cell(row, col) == HIDDEN:
+                return row, col
+
+    def observe(self, revealed):
+        """
+        Reçoit les cases révélées par le dernier clic.
+        :param revealed: Liste des coordonnées (ligne, colonne) révélées.
+        """
+
+
+# Les stratégies sont désignées par leur nom pour pouvoir être transmises aux processus de calcul
+STRATEGIES = {"random": RandomStrategy, "solver": SolverStrategy}
+
+
+def play_games(rows, columns, bombs, strategy, engine, seeds, safe_zone=False):
+    """
+    Joue une série de parties sans interface et mesure chaque étape.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param strategy: Nom d'une stratégie de STRATEGIES, ou classe (rows, columns, bombs, rng) -> stratégie.
+    :param engine: Nom du moteur dans ENGINES ("list" ou "array").
+    :param seeds: Graines des parties à jouer (une partie par graine).
+    :param safe_zone: Si True, le carré 3x3 autour du premier clic est sans bombe.
+    :return: Dictionnaire des résultats (parties, victoires, clics et latences en secondes).
+    """
+    engine_class = ENGINES[engine]
+    if engine_class is None:
+        raise ImportError(f"Le moteur {engine!r} nécessite numpy (pip install numpy)")
+    strategy_class = STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+
+    results = {"games": 0, "wins": 0, "clicks": 0, "generation": [], "reveal": [], "win_check": []}
+    for seed in seeds:
+        game = engine_class(rows, columns, bombs, seed=seed, safe_zone=safe_zone, verbose=False)
+        player = strategy_class(rows, columns, bombs, random.Random(seed))
+
+        row, col = player.next_move(game)
+        start = time.perf_counter()
+        game.generate(row, col)
+        results["generation"].append(time.perf_counter() - start)
+
+        while True:
+            start = time.perf_counter()
+            result, revealed = game.click_cell(row, col)
+            results["reveal"].append(time.perf_counter() - start)
+            results["clicks"] += 1
+            if result == "lost":
+                break
+            player.observe(revealed)
+
+            start = time.perf_counter()
+            won = game.is_won()
+            results["win_check"].append(time.perf_counter() - start)
+            if won:
+                results["wins"] += 1
+                break
+            row, col = player.next_move(game)
+        results["games"] += 1
+    return results
+
+
+def run_benchmark(rows, columns, bombs, games, strategy="random", engine="list", workers=None, seed=0,
+                  safe_zone=False):
+    """
+    Répartit les parties sur un pool de processus et agrège les mesures.
+    :param rows: Nombre de lignes de la grille.
+    :param columns: Nombre de colonnes de la grille.
+    :param bombs: Nombre de bombes sur la grille.
+    :param games: Nombre de parties à jouer.
+    :param strategy: Nom d'une stratégie de STRATEGIES, ou classe de stratégie définie au niveau d'un module.
+    :param engine: Nom du moteur dans ENGINES ("list" ou "array").
+    :param workers: Nombre de processus (par défaut, le nombre de cœurs) ; 1 pour tout jouer dans ce processus.
+    :param seed: Graine de la première partie ; les suivantes utilisent seed + 1, seed + 2...
+    :param safe_zone: Si True, le carré 3x3 autour du premier clic est sans bombe.
+    :return: Dictionnaire des résultats agrégés, avec la durée totale sous la clé "elapsed".
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(seed, seed + games))
+    chunk_count = min(games, workers * 4) or 1
+    chunks = [seeds[k::chunk_count] for k in range(chunk_count)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        parts = [play_games(rows, columns, bombs, strategy, engine, chunk, safe_zone) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_games, rows, columns, bombs, strategy, engine, chunk, safe_zone)
+                       for chunk in chunks]
+            parts = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    results = {"games": 0, "wins": 0, "clicks": 0, "generation": [], "reveal": [], "win_check": []}
+    for part in parts:
+        for key, value in part.items():
+            results[key] += value
+    results["elapsed"] = elapsed
+    return results
+
+
+def summarize(latencies):
+    """
+    Résume une liste de latences.
+    :param latencies: Durées en secondes.
+    :return: Tuple (moyenne, médiane, 99e centile) en microsecondes.
+    """
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    ordered = sorted(latencies)
+    mean = sum(ordered) / len(ordered)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return mean * 1e6, p50 * 1e6, p99 * 1e6
+
+
+def format_report(label, results):
+    """
+    Met en forme les résultats d'un banc d'essai.
+    :param label: Nom de la configuration (ex. "16x30x99").
+    :param results: Dictionnaire renvoyé par run_benchmark.
+    :return: Texte du rapport.
+    """
+    elapsed = results["elapsed"] or 1e-9
+    lines = [
+        f"{label} : {results['games']} parties en {elapsed:.2f} s, "
+        f"{results['wins']} victoires ({100 * results['wins'] / max(results['games'], 1):.1f} %)",
+        f"    {results['games'] / elapsed:12.1f} parties/s {results['clicks'] / elapsed:12.1f} clics/s",
+    ]
+    for key, name in (("generation", "Génération"), ("reveal", "Révélation"), ("win_check", "Victoire")):
+        mean, p50, p99 = summarize(results[key])
+        lines.append(f"    {name:<11} moy {mean:10.1f} µs   p50 {p50:10.1f} µs   p99 {p99:10.1f} µs")
+    return "\n".join(lines)
+
+
+def parse_size(text):
+    """
+    Lit une configuration de grille écrite LIGNESxCOLONNESxBOMBES.
+    :param text: Texte à lire (ex. "16x30x99").
+    :return: Tuple (lignes, colonnes, bombes).
+    """
+    try:
+        rows, columns, bombs = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Taille invalide {text!r}, format attendu LIGNESxCOLONNESxBOMBES")
+    return rows, columns, bombs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai sans interface du moteur de démineur.")
+    parser.add_argument("--size", type=parse_size, action="append",
+                        help="Grille LIGNESxCOLONNESxBOMBES (répétable, défaut : 9x9x10, 16x16x40, 16x30x99)")
+    parser.add_argument("--games", type=int, default=1000, help="Nombre de parties par grille")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="list")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--safe-zone", action="store_true", help="Premier clic entouré de cases sans bombe")
+    args = parser.parse_args(argv)
+
+    for rows, columns, bombs in args.size or [(9, 9, 10), (16, 16, 40), (16, 30, 99)]:
+        results = run_benchmark(rows, columns, bombs, args.games, args.strategy, args.engine, args.workers,
+                                args.seed, args.safe_zone)
+        print(format_report(f"{rows}x{columns}x{bombs}", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+from collections import OrderedDict
+from math import exp, log
+
+from game_logic import HIDDEN, FLAG
+
+MAX_COMPONENT_CELLS = 64  # Au-delà, une composante n'est pas calculée exactement
+CACHE_SIZE = 4096  # Nombre de composantes dont l'énumération est gardée en cache
+
+
+class Solver:
+    def __init__(self, game, rows, columns, bombs):
+        """
+        Solveur par propagation de contraintes construit sur l'affichage d'une partie.
+        Applique d'abord les règles simples (case seule, inclusion de contraintes), puis calcule
+        les probabilités exactes de bombe sur la frontière, composante par composante.
+        Les drapeaux du joueur sont ignorés : seules les déductions du solveur font foi.
+        :param game: Partie observée (Minesweeper ou ArrayMinesweeper).
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre total de bombes.
+        """
+        self.game = game
+        self.rows = rows
+        self.columns = columns
+        self.bombs = bombs
+        self.__numbers = {}  # Case révélée de la frontière -> chiffre affiché
+        self.__constraint = {}  # Case de la frontière -> contrainte (cases inconnues, bombes)
+        self.__dirty = set()  # Cases de la frontière dont la contrainte est à recalculer
+        self.__neighbor_cache = {}
+        self.__revealed = 0  # Nombre de cases révélées
+        self.__safe = set()  # Cases cachées déduites sans bombe
+        self.__mines = set()  # Cases déduites comme bombes
+        self.__cache = OrderedDict()  # Contraintes d'une composante -> énumération
+        self.__probabilities = None  # Dernier calcul de probabilités, invalidé par update
+        self.resync()
+
+    def __neighbors(self, row, col):
+        """
+        Liste les voisines d'une case à l'intérieur de la grille.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        :return: Liste des coordonnées (ligne, colonne) voisines.
+        """
+        neighbors = self.__neighbor_cache.get((row, col))
+        if neighbors is None:
+            neighbors = [
+                (i, j)
+                for i in range(max(row - 1, 0), min(row + 2, self.rows))
+                for j in range(max(col - 1, 0), min(col + 2, self.columns))
+                if i != row or j != col
+            ]
+            self.__neighbor_cache[(row, col)] = neighbors
+        return neighbors
+
+    def __is_hidden(self, row, col):
+        """
+        Indique si une case est encore cachée (éventuellement sous un drapeau).
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        return self.game.get_cell(row, col) in (HIDDEN, FLAG)
+
+    def __track(self, row, col):
+        """
+        Ajoute ou retire une case révélée de la frontière selon qu'elle touche encore une case cachée.
+        :param row: Ligne de la cellule.
+        :param col: Colonne de la cellule.
+        """
+        value = self.game.get_cell(row, col)
+        # Un zéro touche encore une case cachée quand un drapeau a arrêté la propagation : contrainte à 0
+        if value not in (HIDDEN, FLAG) and any(self.__is_hidden(*cell) for cell in self.__neighbors(row, col)):
+            self.__numbers[(row, col)] = int(value)
+        else:
+            self.__numbers.pop((row, col), None)
+        self.__dirty.add((row, col))
+
+    def __mark(self, cells):
+        """
+        Signale que des cases ont changé de statut : les contraintes voisines sont à recalculer.
+        :param cells: Cases nouvellement révélées ou déduites.
+        """
+        for cell in cells:
+            for neighbor in self.__neighbors(*cell):
+                if neighbor in self.__numbers:
+                    self.__dirty.add(neighbor)
+
+    def resync(self):
+        """
+        Reconstruit la frontière par un parcours complet de la matrice affichée.
+        """
+        display = self.game.get_display_matrix()
+        self.__numbers = {}
+        self.__constraint = {}
+        self.__dirty = set()
+        self.__revealed = 0
+        for i, row in enumerate(display):
+            for j, value in enumerate(row):
+                if value not in (HIDDEN, FLAG):
+                    self.__revealed += 1
+                    self.__track(i, j)
+        self.__safe = {cell for cell in self.__safe if self.__is_hidden(*cell)}
+        self.__probabilities = None
+
+    def update(self, revealed):
+        """
+        Met à jour la frontière à partir des seules cases révélées par le dernier clic.
+        :param revealed: Liste des coordonnées (ligne, colonne) révélées.
+        """
+        if not revealed:
+            return
+        self.__revealed += len(revealed)
+        touched = set()
+        for row, col in revealed:
+            self.__safe.discard((row, col))
+            touched.add((row, col))
+            touched.update(self.__neighbors(row, col))
+        for row, col in touched:
+            if not self.__is_hidden(row, col):
+                self.__track(row, col)
+        self.__probabilities = None
+
+    def __constraints(self):
+        """
+        Construit les contraintes de la frontière en retirant les déductions déjà connues.
+        Seules les contraintes dont le voisinage a changé depuis le dernier appel sont recalculées.
+        :return: Ensemble de tuples (cases inconnues, bombes parmi elles).
+        """
+        for row, col in self.__dirty:
+            value = self.__numbers.get((row, col))
+            if value is None:
+                self.__constraint.pop((row, col), None)
+                continue
+            unknown = []
+            for cell in self.__neighbors(row, col):
+                if cell in self.__mines:
+                    value -= 1
+                elif cell not in self.__safe and self.__is_hidden(*cell):
+                    unknown.append(cell)
+            if unknown:
+                self.__constraint[(row, col)] = (frozenset(unknown), value)
+            else:
+                self.__constraint.pop((row, col), None)
+        self.__dirty.clear()
+        return set(self.__constraint.values())
+
+    def analyze(self):
+        """
+        Applique les règles simples jusqu'à ce qu'elles ne déduisent plus rien.
+        :return: Tuple (cases sûres, bombes) des déductions certaines.
+        """
+        constraints = self.__constraints()
+        changed = True
+        while changed:
+            changed = False
+            by_cell = {}
+            for constraint in constraints:
+                cells, value = constraint
+                if value == 0 and cells - self.__safe:
+                    self.__mark(cells - self.__safe)
+                    self.__safe |= cells
+                    changed = True
+                elif value == len(cells) and cells - self.__mines:
+                    self.__mark(cells - self.__mines)
+                    self.__mines |= cells
+                    changed = True
+                for cell in cells:
+                    by_cell.setdefault(cell, []).append(constraint)
+
+            # Règle d'inclusion : si A est inclus dans B, B \ A contient exactement vB - vA bombes
+            for small_cells, small_value in constraints:
+                candidates = {c for cell in small_cells for c in by_cell[cell]}
+                for big_cells, big_value in candidates:
+                    if len(big_cells) <= len(small_cells) or not small_cells <= big_cells:
+                        continue
+                    rest = big_cells - small_cells
+                    if big_value == small_value and rest - self.__safe:
+                        self.__mark(rest - self.__safe)
+                        self.__safe |= rest
+                        changed = True
+                    elif big_value - small_value == len(rest) and rest - self.__mines:
+                        self.__mark(rest - self.__mines)
+                        self.__mines |= rest
+                        changed = True
+
+            if changed:
+                constraints = self.__constraints()
+                self.__probabilities = None
+        return set(self.__safe), set(self.__mines)
+
+    def __components(self, constraints):
+        """
+        Sépare les contraintes en composantes indépendantes (aucune case inconnue en commun).
+        :param constraints: Ensemble de tuples (cases inconnues, bombes).
+        :return: Liste de listes de contraintes.
+        """
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for cells, _ in constraints:
+            cells = list(cells)
+            for cell in cells:
+                parent.setdefault(cell, cell)
+            root = find(cells[0])
+            for cell in cells[1:]:
+                parent[find(cell)] = root
+
+        groups = {}
+        for constraint in constraints:
+            groups.setdefault(find(next(iter(constraint[0]))), []).append(constraint)
+        return list(groups.values())
+
+    def __enumerate(self, component):
+        """
+        Compte toutes les configurations de bombes compatibles avec une composante.
+        Le résultat est mis en cache : une composante inchangée d'un clic à l'autre n'est pas recalculée.
+        :param component: Liste de contraintes (cases inconnues, bombes).
+        :return: Tuple (cases, solutions par nombre de bombes k, occurrences par case et par k).
+        """
+        key = frozenset(component)
+        if key in self.__cache:
+            self.__cache.move_to_end(key)
+            return self.__cache[key]
+
+        # Ordonne les cases pour que les contraintes se ferment au plus tôt : on part d'une extrémité
+        # de la frontière puis on complète toujours la contrainte ouverte qui a le moins de cases libres
+        by_cell = {}
+        for index, (cells, _) in enumerate(component):
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(index)
+        free = [len(cells) for cells, _ in component]
+        order, seen = [], set()
+        opened = set()
+        while len(order) < len(by_cell):
+            if opened:
+                index = min(opened, key=lambda k: (free[k], k))
+                cell = min(component[index][0] - seen)
+            else:
+                cell = min((c for c in by_cell if c not in seen), key=lambda c: (len(by_cell[c]), c))
+            order.append(cell)
+            seen.add(cell)
+            for index in by_cell[cell]:
+                free[index] -= 1
+                if free[index]:
+                    opened.add(index)
+                else:
+                    opened.discard(index)
+        links = [by_cell[cell] for cell in order]
+
+        # Programmation dynamique le long de cet ordre : l'état est le nombre de bombes restant à placer
+        # dans chaque contrainte entamée mais pas encore fermée ; les configurations qui partagent un état
+        # sont comptées ensemble au lieu d'être énumérées une à une.
+        size = len(order)
+        rank = {cell: p for p, cell in enumerate(order)}
+        positions = [sorted(rank[cell] for cell in cells) for cells, _ in component]
+        opened_after = [
+            [index for index, pos in enumerate(positions) if pos[0] <= p < pos[-1]]
+            for p in range(size)
+        ]
+        steps = []
+        for p in range(size):
+            before = opened_after[p - 1] if p else []
+            where = {index: k for k, index in enumerate(before)}
+            touched = [(index, sum(1 for q in positions[index] if q > p)) for index in links[p]]
+            steps.append((where, touched))
+
+        def advance(p, state, value):
+            """
+            Applique le choix value (0 ou 1) à la case p.
+            :return: Nouvel état, ou None si une contrainte devient impossible.
+            """
+            where, touched = steps[p]
+            updated = {}
+            for index, after in touched:
+                rest = (state[where[index]] if index in where else component[index][1]) - value
+                if not 0 <= rest <= after:
+                    return None
+                updated[index] = rest
+            return tuple(updated[index] if index in updated else state[where[index]]
+                         for index in opened_after[p])
+
+        def add(target, key, poly, shift):
+            current = target.setdefault(key, {})
+            for k, ways in poly.items():
+                current[k + shift] = current.get(k + shift, 0) + ways
+
+        forward = [{(): {0: 1}}]
+        for p in range(size):
+            layer = {}
+            for state, poly in forward[p].items():
+                for value in (0, 1):
+                    following = advance(p, state, value)
+                    if following is not None:
+                        add(layer, following, poly, value)
+            forward.append(layer)
+
+        backward = [None] * size + [{(): {0: 1}}]
+        for p in range(size - 1, -1, -1):
+            layer = {}
+            for state in forward[p]:
+                for value in (0, 1):
+                    following = advance(p, state, value)
+                    if following is not None and following in backward[p + 1]:
+                        add(layer, state, backward[p + 1][following], value)
+            backward[p] = layer
+
+        solutions = forward[size].get((), {})
+        hits = {k: [0] * size for k in solutions}
+        for p in range(size):
+            for state, poly in forward[p].items():
+                following = advance(p, state, 1)
+                if following is None or following not in backward[p + 1]:
+                    continue
+                rest = backward[p + 1][following]
+                for a, ways_a in poly.items():
+                    for b, ways_b in rest.items():
+                        hits[a + b + 1][p] += ways_a * ways_b
+
+        result = (order, solutions, hits)
+        self.__cache[key] = result
+        if len(self.__cache) > CACHE_SIZE:
+            self.__cache.popitem(last=False)
+        return result
+
+    def probabilities(self):
+        """
+        Calcule la probabilité de bombe de chaque case de la frontière, en tenant compte
+        du nombre total de bombes restantes et des cases cachées hors frontière.
+        :return: Tuple (probabilité par case de la frontière, probabilité d'une case hors frontière).
+        """
+        if self.__probabilities is not None:
+            return self.__probabilities
+
+        self.analyze()
+        constraints = self.__constraints()
+        remaining = self.bombs - len(self.__mines)
+        hidden = self.rows * self.columns - self.__revealed - len(self.__mines) - len(self.__safe)
+
+        probabilities = {}
+        enumerated = []
+        for component in self.__components(constraints):
+            cells = set().union(*(cells for cells, _ in component))
+            if len(cells) > MAX_COMPONENT_CELLS:
+                # Estimation locale : la contrainte la plus pessimiste de chaque case
+                for cells_, value in component:
+                    for cell in cells_:
+                        probabilities[cell] = max(probabilities.get(cell, 0.0), value / len(cells_))
+            else:
+                enumerated.append(self.__enumerate(component))
+                hidden -= len(cells)
+        sea = hidden  # Cases cachées hors des composantes énumérées (cases estimées comprises)
+
+        # Calcul en flottants : chaque distribution est ramenée à un maximum de 1 et son facteur d'échelle
+        # gardé en logarithme. Les comptes d'une composante sont divisés par leur maximum : ce facteur
+        # multiplie tous les termes d'une même probabilité et se simplifie.
+        def normalized(distribution, scale):
+            top = max(distribution.values(), default=0)
+            if not top:
+                return distribution, scale
+            return {k: ways / top for k, ways in distribution.items()}, scale + log(top)
+
+        def convolve(left, right):
+            (left, left_scale), (right, right_scale) = left, right
+            result = {}
+            for a, wa in left.items():
+                for b, wb in right.items():
+                    result[a + b] = result.get(a + b, 0.0) + wa * wb
+            return normalized(result, left_scale + right_scale)
+
+        components = []
+        for order, solutions, hits in enumerated:
+            top = max(solutions.values(), default=1)
+            components.append((order, {k: ways / top for k, ways in solutions.items()},
+                               {k: [count / top for count in counts] for k, counts in hits.items()}))
+
+        # others[k] : distribution du nombre de bombes de toutes les composantes sauf la k-ième
+        prefix = [({0: 1.0}, 0.0)]
+        for _, solutions, _ in components:
+            prefix.append(convolve(prefix[-1], (solutions, 0.0)))
+        suffix = [({0: 1.0}, 0.0)]
+        for _, solutions, _ in reversed(components):
+            suffix.append(convolve(suffix[-1], (solutions, 0.0)))
+        suffix.reverse()
+        every, every_scale = prefix[-1]
+
+        # Poids hors frontière ramenés au terme dominant du total, qui vaut alors 1 : ni le total
+        # ni les termes qui comptent ne sortent de la plage des flottants
+        log_weights = self.__sea_log_weights(sea, remaining, max(every))
+        reference = max((log(w) + log_weights[m] for m, w in every.items() if w and m in log_weights),
+                        default=None)
+        weights = {} if reference is None else {m: exp(min(value - reference, 709.0))
+                                                for m, value in log_weights.items()}
+
+        def weight(mines):
+            return weights.get(mines, 0.0)
+
+        total = sum(w * weight(m) for m, w in every.items())
+        if total == 0:
+            # Affichage incohérent (ne devrait pas arriver) : probabilité uniforme
+            uniform = remaining / max(hidden, 1)
+            for order, _, _ in components:
+                for cell in order:
+                    probabilities[cell] = uniform
+            self.__probabilities = (probabilities, uniform)
+            return self.__probabilities
+
+        for k, (order, solutions, hits) in enumerate(components):
+            others, others_scale = convolve(prefix[k], suffix[k + 1])
+            cell_weights = [0.0] * len(order)
+            for mines, counts in hits.items():
+                factor = sum(w * weight(mines + m) for m, w in others.items())
+                if factor:
+                    for index, count in enumerate(counts):
+                        cell_weights[index] += count * factor
+            ratio = exp(others_scale - every_scale) / total
+            for cell, cell_weight in zip(order, cell_weights):
+                probabilities[cell] = cell_weight * ratio
+
+        sea_mines = sum(w * weight(m) * (remaining - m) for m, w in every.items())
+        sea_probability = sea_mines / total / sea if sea else 1.0
+        self.__probabilities = (probabilities, sea_probability)
+        return self.__probabilities
+
+    @staticmethod
+    def __sea_log_weights(sea, remaining, most):
+        """
+        Logarithmes des poids des répartitions de bombes hors frontière, proportionnels à
+        comb(sea, remaining - m) pour m bombes sur la frontière. Les valeurs possibles de m vont de
+        low = max(0, remaining - sea) à high = min(most, remaining) ; chaque poids est pris par rapport
+        à la référence m = low, comme produit des rapports de coefficients binomiaux consécutifs
+        (f - k + 1) / (sea - f + k). Le coût dépend du nombre de valeurs de m, c'est-à-dire de la
+        frontière, et non du nombre de cases hors frontière.
+        :param sea: Nombre de cases cachées hors frontière.
+        :param remaining: Nombre de bombes restant à placer.
+        :param most: Nombre maximal de bombes sur la frontière.
+        :return: Dictionnaire m -> logarithme du poids relatif, pour les seules valeurs de m possibles.
+        """
+        low = max(0, remaining - sea)
+        high = min(most, remaining)
+        free = remaining - low
+        log_weights = {}
+        value = 0.0
+        for k in range(high - low + 1):
+            if k:
+                value += log((free - k + 1) / (sea - free + k))
+            log_weights[low + k] = value
+        return log_weights
+
+    def hint(self, rng=None):
+        """
+        Propose le meilleur coup : une case sûre si possible, sinon la case la moins risquée.
+        :param rng: Générateur aléatoire (random.Random) pour départager les cases hors frontière.
+        :return: Tuple ((ligne, colonne), probabilité de bombe).
+        """
+        safe, _ = self.analyze()
+        if safe:
+            return min(safe), 0.0
+
+        probabilities, sea_probability = self.probabilities()
+        best = min(probabilities.items(), key=lambda item: item[1], default=(None, 1.0))
+        if best[0] is not None and best[1] <= sea_probability:
+            return best
+        return self.__sea_cell(probabilities, rng), sea_probability
+
+    def __sea_cell(self, frontier, rng):
+        """
+        Choisit une case cachée hors frontière, au hasard si un générateur est fourni.
+        :param frontier: Cases de la frontière à éviter.
+        :param rng: Générateur aléatoire (random.Random) ou None.
+        :return: Coordonnées (ligne, colonne).
+        """
+        def is_sea(cell):
+            return cell not in frontier and cell not in self.__mines and self.__is_hidden(*cell)
+
+        if rng is not None:
+            for _ in range(64):
+                cell = (rng.randrange(self.rows), rng.randrange(self.columns))
+                if is_sea(cell):
+                    return cell
+        for i in range(self.rows):
+            for j in range(self.columns):
+                if is_sea((i, j)):
+                    return i, j
+        return min(frontier, key=frontier.get)
+
+
+class SolverStrategy:
+    def __init__(self, rows, columns, bombs, rng):
+        """
+        Stratégie de simulation qui joue les déductions du solveur et, à défaut, la case la moins risquée.
+        :param rows: Nombre de lignes de la grille.
+        :param columns: Nombre de colonnes de la grille.
+        :param bombs: Nombre de bombes sur la grille.
+        :param rng: Générateur aléatoire (random.Random) propre à la partie.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.bombs = bombs
+        self.rng = rng
+        self.solver = None
+
+    def next_move(self, game):
+        """
+        Choisit la prochaine case à cliquer.
+        :param game: Partie en cours.
+        :return: Coordonnées (ligne, colonne) de la case à cliquer.
+        """
+        if self.solver is None:
+            self.solver = Solver(game, self.rows, self.columns, self.bombs)
+        cell, _ = self.solver.hint(self.rng)
+        return cell
+
+    def observe(self, revealed):
+        """
+        Transmet au solveur les cases révélées par le dernier clic.
+        :param revealed: Liste des coordonnées (ligne, colonne) révélées.
+        """
+        if self.solver is not None:
+            self.solver.update(revealed)
@@ -0,0 +1,100 @@
+import argparse
+import random
+import sys
+
+from exo import Genealogie, blocs_dico, dico
+
+
+def arbre_aleatoire(nombre, generateur, portee=50):
+    """
+    Tire un arbre généalogique au hasard : le parent de chaque personne est choisi parmi les portee
+    précédentes (ou aucun, pour quelques racines), les années sont entières pour provoquer des égalités.
+    :param nombre: Nombre de personnes.
+    :param generateur: Générateur aléatoire (random.Random).
+    :param portee: Nombre de personnes précédentes parmi lesquelles le parent est tiré.
+    :return: Instance de Genealogie.
+    """
+    noms = [f"p{i}" for i in range(nombre)]
+    parents = []
+    naissances = []
+    for i in range(nombre):
+        parent = -1 if i == 0 or generateur.random() < 0.05 else generateur.randrange(max(i - portee, 0), i)
+        parents.append(parent)
+        naissances.append(generateur.randrange(100) if parent < 0 else
+                          naissances[parent] + generateur.randrange(15, 80))
+    morts = [naissance + generateur.randrange(1, 120) for naissance in naissances]
+    transferes = [generateur.random() < 0.05 for _ in range(nombre)]
+    return Genealogie(noms, parents, naissances, morts, transferes)
+
+
+def descendants_naifs(genealogie, i):
+    """
+    Descendants d'une personne, en remontant les ancêtres de chacune des autres.
+    :param genealogie: Instance de Genealogie.
+    :param i: Indice de la personne.
+    :return: Liste des indices des descendants.
+    """
+    resultat = []
+    for j in range(len(genealogie.noms)):
+        ancetre = genealogie.parents[j]
+        while ancetre >= 0 and ancetre != i:
+            ancetre = genealogie.parents[ancetre]
+        if ancetre == i:
+            resultat.append(j)
+    return resultat
+
+
+def verifier(genealogie):
+    """
+    Compare chaque réponse de Genealogie à un parcours naïf des ancêtres.
+    :param genealogie: Instance de Genealogie.
+    :return: Liste des écarts, un message par réponse fausse.
+    """
+    noms, morts, transferes = genealogie.noms, genealogie.morts, genealogie.transferes
+    connus = genealogie.compter_descendants_connus()
+    vus_mourir = genealogie.compter_descendants_vus_mourir()
+    ecarts = []
+    for i, nom in enumerate(noms):
+        descendants = descendants_naifs(genealogie, i)
+        attendus = {
+            "connus": sorted(noms[j] for j in descendants if genealogie.naissances[j] < morts[i]),
+            "vus mourir": sorted(noms[j] for j in descendants if not transferes[j] and morts[j] < morts[i]),
+        }
+        obtenus = {
+            "connus": sorted(genealogie.descendants_connus(nom)),
+            "vus mourir": sorted(genealogie.descendants_vus_mourir(i)),
+        }
+        comptes = {"connus": connus[nom], "vus mourir": vus_mourir[nom]}
+        for question, attendu in attendus.items():
+            if obtenus[question] != attendu:
+                ecarts.append(f"{nom}, descendants {question} : {obtenus[question]} au lieu de {attendu}")
+            if comptes[question] != len(attendu):
+                ecarts.append(f"{nom}, nombre de descendants {question} : "
+                              f"{comptes[question]} au lieu de {len(attendu)}")
+    attendus = sorted((noms[parent], noms[i]) for i, parent in enumerate(genealogie.parents)
+                      if parent >= 0 and not transferes[i] and morts[i] < morts[parent])
+    if sorted(genealogie.enfants_vus_mourir()) != attendus:
+        ecarts.append(f"Enfants vus mourir : {sorted(genealogie.enfants_vus_mourir())} au lieu de {attendus}")
+    return ecarts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vérifie Genealogie contre un parcours naïf des ancêtres.")
+    parser.add_argument("--arbres", type=int, default=50, help="Nombre d'arbres tirés au hasard")
+    parser.add_argument("--personnes", type=int, default=600, help="Nombre de personnes par arbre")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # La lignée de l'énoncé : chaque patriarche est l'enfant du précédent, Énoch est transféré
+    ecarts = verifier(Genealogie.depuis_lignee(*next(blocs_dico(dico))))
+    for arbre in range(args.arbres):
+        generateur = random.Random(args.graine + arbre)
+        ecarts += verifier(arbre_aleatoire(generateur.randrange(1, args.personnes + 1), generateur))
+    for ecart in ecarts[:20]:
+        print(ecart)
+    print(f"{args.arbres + 1} arbres vérifiés, {len(ecarts)} écarts")
+    return 1 if ecarts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())